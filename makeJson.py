@@ -1,11 +1,27 @@
 import tkinter as tk
-from tkinter import ttk, scrolledtext, messagebox
+from tkinter import ttk, scrolledtext, messagebox, filedialog
 import json
+import queue
 import re
+import threading
+
+from neisMapping import iter_text_rows, pairs_from_rows
+
+# 헤더로 보고 건너뛸 첫 열 값 (변환기의 기존 동작대로 key/keys만, '과목명'은 데이터로 취급)
+HEADER_KEYS = ('key', 'keys')
+# 열 구분이 없는 텍스트에서 한국어 단어(공백으로 이어진 단어 포함) 단위로 분리
+KOREAN_WORDS_PATTERN = re.compile(r'[가-힣]+(?:\s+[가-힣]+)*')
+# 변환 결과 확인 주기와 결과 창에 한 번에 넣을 글자 수 (큰 결과도 화면이 멈추지 않도록 나눠 표시)
+POLL_INTERVAL_MS = 50
+OUTPUT_CHUNK_CHARS = 32 * 1024
 
 class ExcelToJsonConverter:
     def __init__(self, root):
         self.root = root
+        self.events = queue.Queue()  # 변환 스레드 -> GUI (완료/오류)
+        self.worker = None
+        self.json_output = ""  # 마지막 변환 결과 (복사/저장은 위젯 대신 이 문자열 사용)
+        self.render_job = None  # 결과 창에 나눠 넣는 after 작업
         self.root.title("Excel to JSON 변환기")
         self.root.geometry("800x600")
         
@@ -60,12 +76,13 @@ class ExcelToJsonConverter:
         button_frame.grid(row=2, column=0, columnspan=2, pady=10)
         
         # 변환 버튼
-        ttk.Button(
+        self.convert_button = ttk.Button(
             button_frame, 
             text="JSON으로 변환", 
             command=self.convert_to_json,
             style="Accent.TButton"
-        ).pack(side=tk.LEFT, padx=(0, 10))
+        )
+        self.convert_button.pack(side=tk.LEFT, padx=(0, 10))
         
         # 지우기 버튼
         ttk.Button(
@@ -76,9 +93,13 @@ class ExcelToJsonConverter:
         
         # 출력 라벨
         ttk.Label(main_frame, text="JSON 결과:", font=("Arial", 12, "bold")).grid(
-            row=4, column=0, columnspan=2, sticky=tk.W, pady=(10, 5)
+            row=4, column=0, sticky=tk.W, pady=(10, 5)
         )
         
+        # 변환/표시 진행 상태
+        self.status_label = ttk.Label(main_frame, text="")
+        self.status_label.grid(row=4, column=1, sticky=tk.E, pady=(10, 5))
+        
         # 출력 텍스트 영역
         self.output_text = scrolledtext.ScrolledText(
             main_frame, 
@@ -90,15 +111,24 @@ class ExcelToJsonConverter:
         )
         self.output_text.grid(row=5, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(0, 10))
         
-        # 복사 버튼
+        # 복사/저장 버튼
+        output_button_frame = ttk.Frame(main_frame)
+        output_button_frame.grid(row=6, column=0, columnspan=2, pady=10)
         self.copy_button = ttk.Button(
-            main_frame, 
+            output_button_frame, 
             text="클립보드에 복사", 
             command=self.copy_to_clipboard,
             state=tk.DISABLED,
             style="Accent.TButton"
         )
-        self.copy_button.grid(row=6, column=0, columnspan=2, pady=10)
+        self.copy_button.pack(side=tk.LEFT, padx=(0, 10))
+        self.save_button = ttk.Button(
+            output_button_frame, 
+            text="파일로 저장", 
+            command=self.save_to_file,
+            state=tk.DISABLED
+        )
+        self.save_button.pack(side=tk.LEFT)
         
         # 예시 데이터 추가
         example_text = """Key Value 국어 국어 화법과 작문 국어 독서 국어 언어와 매체 국어 문학 국어 실용 국어 국어 심화 국어 국어"""
@@ -170,33 +200,15 @@ class ExcelToJsonConverter:
     
     def parse_excel_data(self, text):
         """엑셀 데이터를 파싱하여 딕셔너리로 변환"""
-        # 줄바꿈과 탭으로 분리
-        lines = text.strip().split('\n')
-        result = {}
-        
-        for line in lines:
-            # 탭 또는 여러 공백으로 분리
-            parts = re.split(r'\t+|\s{2,}', line.strip())
-            parts = [part.strip() for part in parts if part.strip()]
-            
-            # 첫 번째 줄이 헤더인 경우 건너뛰기
-            if len(parts) >= 2 and parts[0].lower() in ['key', 'keys']:
-                continue
-            
-            # Key-Value 쌍 처리
-            if len(parts) >= 2:
-                key = parts[0]
-                value = parts[1]
-                result[key] = value
-            elif len(parts) == 1:
-                # 단일 값인 경우, 이전 패턴을 따라 처리
-                continue
+        # 줄마다 탭 또는 여러 공백으로 분리하여 Key-Value 쌍 처리 (헤더 행, 단일 값 행은 건너뜀)
+        lines = text.strip().splitlines()
+        result = dict(pairs_from_rows(iter_text_rows(lines), HEADER_KEYS))
         
         # 만약 탭/공백 분리가 제대로 안된 경우, 연속된 한국어 단어들을 분리 시도
         if not result:
             # 모든 텍스트를 하나의 문자열로 합치고 한국어 단어 단위로 분리
             all_text = ' '.join(lines)
-            words = re.findall(r'[가-힣]+(?:\s+[가-힣]+)*', all_text)
+            words = KOREAN_WORDS_PATTERN.findall(all_text)
             
             # 짝수 개의 단어가 있다면 Key-Value 쌍으로 처리
             if len(words) % 2 == 0:
@@ -207,45 +219,79 @@ class ExcelToJsonConverter:
         return result
     
     def convert_to_json(self):
-        """입력된 데이터를 JSON으로 변환"""
+        """입력된 데이터를 작업 스레드에서 JSON으로 변환 (화면은 계속 응답)"""
         input_data = self.input_text.get("1.0", tk.END).strip()
         
         if not input_data:
             messagebox.showwarning("경고", "변환할 데이터를 입력해주세요.")
             return
+        if self.worker is not None and self.worker.is_alive():
+            return
         
+        self.clear_output()
+        self.convert_button.config(state=tk.DISABLED)
+        self.status_label.config(text="변환 중...")
+        self.worker = threading.Thread(target=self.run_conversion, args=(input_data,), daemon=True)
+        self.worker.start()
+        self.root.after(POLL_INTERVAL_MS, self.poll_conversion)
+    
+    def run_conversion(self, input_data):
+        """작업 스레드 - 파싱과 JSON 문자열 생성 (Tk에 직접 접근하지 않음)"""
         try:
-            # 데이터 파싱
             parsed_data = self.parse_excel_data(input_data)
-            
-            if not parsed_data:
-                messagebox.showerror("오류", "데이터를 파싱할 수 없습니다. 형식을 확인해주세요.")
-                return
-            
             # JSON 형식으로 변환 (한국어 지원을 위해 ensure_ascii=False)
-            json_output = json.dumps(parsed_data, indent=4, ensure_ascii=False)
-            
-            # 출력 텍스트 영역에 표시
-            self.output_text.config(state=tk.NORMAL)
-            self.output_text.delete("1.0", tk.END)
-            self.output_text.insert("1.0", json_output)
-            self.output_text.config(state=tk.DISABLED)
-            
-            # 복사 버튼 활성화
-            self.copy_button.config(state=tk.NORMAL)
-            
-            messagebox.showinfo("성공", f"변환 완료! {len(parsed_data)}개의 항목이 변환되었습니다.")
-            
+            json_output = json.dumps(parsed_data, indent=4, ensure_ascii=False) if parsed_data else ""
+            self.events.put(('done', (len(parsed_data), json_output)))
         except Exception as e:
-            messagebox.showerror("오류", f"변환 중 오류가 발생했습니다: {str(e)}")
+            self.events.put(('error', f"변환 중 오류가 발생했습니다: {str(e)}"))
+    
+    def poll_conversion(self):
+        """변환 스레드 결과 확인 (메인 스레드)"""
+        try:
+            event, value = self.events.get_nowait()
+        except queue.Empty:
+            self.root.after(POLL_INTERVAL_MS, self.poll_conversion)
+            return
+        
+        self.convert_button.config(state=tk.NORMAL)
+        if event == 'error':
+            self.status_label.config(text="")
+            messagebox.showerror("오류", value)
+            return
+        count, json_output = value
+        if not count:
+            self.status_label.config(text="")
+            messagebox.showerror("오류", "데이터를 파싱할 수 없습니다. 형식을 확인해주세요.")
+            return
+        self.json_output = json_output
+        self.render_output(0, count)
+    
+    def render_output(self, start, count):
+        """결과 문자열을 OUTPUT_CHUNK_CHARS씩 나눠 출력 텍스트 영역에 추가하고 다음 조각을 예약"""
+        end = start + OUTPUT_CHUNK_CHARS
+        self.output_text.config(state=tk.NORMAL)
+        self.output_text.insert(tk.END, self.json_output[start:end])
+        self.output_text.config(state=tk.DISABLED)
+        
+        total = len(self.json_output)
+        if end < total:
+            self.status_label.config(text=f"{count}개 항목 표시 중... {end * 100 // total}%")
+            self.render_job = self.root.after(1, self.render_output, end, count)
+            return
+        
+        self.render_job = None
+        self.status_label.config(text=f"{count}개 항목")
+        # 복사/저장 버튼 활성화
+        self.copy_button.config(state=tk.NORMAL)
+        self.save_button.config(state=tk.NORMAL)
+        messagebox.showinfo("성공", f"변환 완료! {count}개의 항목이 변환되었습니다.")
     
     def copy_to_clipboard(self):
         """JSON 결과를 클립보드에 복사"""
         try:
-            json_text = self.output_text.get("1.0", tk.END).strip()
-            if json_text:
+            if self.json_output:
                 self.root.clipboard_clear()
-                self.root.clipboard_append(json_text)
+                self.root.clipboard_append(self.json_output)
                 self.root.update()
                 messagebox.showinfo("복사 완료", "JSON 데이터가 클립보드에 복사되었습니다.")
             else:
@@ -253,13 +299,42 @@ class ExcelToJsonConverter:
         except Exception as e:
             messagebox.showerror("오류", f"클립보드 복사 중 오류가 발생했습니다: {str(e)}")
     
-    def clear_all(self):
-        """모든 텍스트 영역 지우기"""
-        self.input_text.delete("1.0", tk.END)
+    def save_to_file(self):
+        """JSON 결과를 파일로 저장"""
+        if not self.json_output:
+            messagebox.showwarning("경고", "저장할 데이터가 없습니다.")
+            return
+        path = filedialog.asksaveasfilename(
+            title="JSON 파일로 저장",
+            defaultextension=".json",
+            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(self.json_output)
+            messagebox.showinfo("저장 완료", f"JSON 데이터를 저장했습니다: {path}")
+        except OSError as e:
+            messagebox.showerror("오류", f"파일 저장 중 오류가 발생했습니다: {str(e)}")
+    
+    def clear_output(self):
+        """출력 텍스트 영역과 결과 지우기 (표시 중인 작업 취소)"""
+        if self.render_job is not None:
+            self.root.after_cancel(self.render_job)
+            self.render_job = None
+        self.json_output = ""
+        self.status_label.config(text="")
         self.output_text.config(state=tk.NORMAL)
         self.output_text.delete("1.0", tk.END)
         self.output_text.config(state=tk.DISABLED)
         self.copy_button.config(state=tk.DISABLED)
+        self.save_button.config(state=tk.DISABLED)
+    
+    def clear_all(self):
+        """모든 텍스트 영역 지우기"""
+        self.input_text.delete("1.0", tk.END)
+        self.clear_output()
 
 def main():
     root = tk.Tk()
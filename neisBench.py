@@ -0,0 +1,304 @@
+"""시수배정현황 처리 벤치마크
+
+NEIS 시수배정현황 형태의 합성 파일(헤더 행에 '총시수', B열 과목, D열 교사명,
+학년별 여러 시트)을 만들고 처리 단계별 소요 시간과 최대 메모리를 측정합니다.
+
+--imports를 주면 대신 모듈 import 시간을 별도 프로세스에서 재서 예산과 비교하고,
+--check-resolver를 주면 교과(군) 분류 결과를 단순 순차 탐색 결과와 비교합니다.
+
+사용 예:
+    python -m neisBench --schools 1 50 500 --json bench.json
+    python -m neisBench --imports
+    python -m neisBench --check-resolver
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import openpyxl
+
+from neisCore import (TimeTableCore, RecordStore, DEFAULT_MAPPING_FILE, open_workbook, parse_school_name,
+                      add_log_handler, remove_log_handler)
+
+SURNAMES = "김이박최정강조윤장임한오서신권황안송류홍"
+GIVEN_NAMES = ["민준", "서연", "도윤", "지우", "하준", "서윤", "시우", "지민", "주원", "하은",
+               "예준", "수아", "건우", "지유", "현우", "채원", "선우", "다은", "유준", "소율"]
+# 정규화 경로를 거치도록 과목명에 섞는 접미사
+SUBJECT_SUFFIXES = ['', '', '', 'Ⅰ', 'Ⅱ', '1', '2', '(심화)', ' 기초']
+# 매핑에 없는 과목 (기타 분류 경로)
+UNMAPPED_SUBJECTS = ["창의융합탐구", "학교자율과목", "진로탐색활동", "지역연계프로젝트"]
+STAGES = ["extract_data", "process_workbook", "get_subject_group", "aggregate_school_data", "save_results"]
+# 모듈별 import 시간 예산 (밀리초, 여러 번 잰 값 중 최솟값 기준)
+IMPORT_BUDGETS_MS = {"neisCore": 60, "neisCli": 80, "neisToxlsx_new": 150}
+# 시작 시 로드되면 안 되는 무거운 모듈 (해당 단계에서만 로드)
+DEFERRED_MODULES = ["openpyxl", "concurrent.futures", "multiprocessing", "sqlite3", "subprocess"]
+# 분류 회귀 확인용 과목명 (정규화 결과가 ''가 되는 이름, 빈 매핑 포함)
+RESOLVER_CHECK_SUBJECTS = ["", "(공통)", "Ⅱ", "3", "*수학", "수학Ⅰ(심화)", "국어 기초", "물리학Ⅱ-1"]
+RESOLVER_CHECK_MAPPINGS = [("빈 매핑", {}), ("작은 매핑", {"수학": "수학", "국어": "국어", "물리학": "과학"})]
+IMPORT_PROBE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(elapsed, *[name for name in {deferred!r} if name in sys.modules])
+"""
+
+
+def subject_pool(mapping, size, rng):
+    """합성 파일에 사용할 과목명 목록 (매핑 키 + 변형 + 매핑에 없는 과목)"""
+    keys = list(mapping)
+    names = [key + rng.choice(SUBJECT_SUFFIXES) for key in rng.sample(keys, min(size, len(keys)))]
+    return names + UNMAPPED_SUBJECTS
+
+
+def generate_workbook(path, subjects, rng, teachers=40, sheets=3, subjects_per_teacher=3):
+    """NEIS 시수배정현황 형태의 합성 xlsx 파일 생성"""
+    wb = openpyxl.Workbook(write_only=True)
+    teacher_names = [f"{rng.choice(SURNAMES)}{rng.choice(GIVEN_NAMES)}{idx:02d}" for idx in range(teachers)]
+    for grade in range(1, sheets + 1):
+        ws = wb.create_sheet(f"{grade}학년")
+        ws.append(["2025학년도 시수배정현황"])
+        ws.append([])
+        ws.append(["번호", "과목", "학년", "교사명", "반", "총시수"])
+        row_no = 0
+        for name in teacher_names:
+            for class_no in range(1, rng.randint(1, subjects_per_teacher) + 1):
+                row_no += 1
+                ws.append([row_no, f"{rng.choice(subjects)}-{class_no}", grade, name, f"{class_no}반",
+                           rng.randint(2, 18)])
+        ws.append([None, "2025-03-01 출력"])
+    wb.save(path)
+
+
+def generate_exports(out_dir, schools, mapping, seed=0, subjects=120, **kwargs):
+    """학교 수만큼 합성 파일을 만들고 경로 목록 반환 (같은 설정으로 만든 파일이 있으면 재사용)"""
+    os.makedirs(out_dir, exist_ok=True)
+    file_paths = []
+    for school_idx in range(schools):
+        path = os.path.join(out_dir, f"시수배정현황(벤치{school_idx:03d}고).xlsx")
+        if not os.path.exists(path):
+            rng = random.Random(f"{seed}:{school_idx}")
+            generate_workbook(path, subject_pool(mapping, subjects, rng), rng, **kwargs)
+        file_paths.append(path)
+    return file_paths
+
+
+def measure(func, memory=True):
+    """func 실행 시간(초)과 최대 할당 메모리(바이트) 측정
+
+    시간은 추적 없이 한 번 실행하여 재고, memory가 True이면 tracemalloc을 켜고
+    한 번 더 실행하여 최대 메모리를 잽니다 (추적 오버헤드가 시간에 섞이지 않도록).
+    """
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            func()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def run_benchmark(file_paths, mapping_path, output_path, memory=True):
+    """단계별 측정 결과를 {단계: (초, 최대 메모리)} 형태로 반환"""
+    core = TimeTableCore()
+    mapping = core.load_subject_group_mapping(mapping_path)
+    results = {}
+
+    def extract_first_file():
+        wb = open_workbook(file_paths[0])
+        try:
+            return [core.extract_data(ws) for ws in wb.worksheets]
+        finally:
+            wb.close()
+
+    def process_all():
+        return [(path, records) for path, records in core.parse_files(file_paths)]
+
+    _, *results["extract_data"] = measure(extract_first_file, memory)
+    parsed, *results["process_workbook"] = measure(process_all, memory)
+
+    store = RecordStore()
+    for path, records in parsed:
+        store.extend(store.add_school(parse_school_name(path)), records)
+    subjects = [store.subjects[code] for code in store.subject]
+
+    # 분류와 집계는 분류 결과 메모가 비어 있는 새 인스턴스로 측정
+    def resolve_all():
+        fresh = TimeTableCore()
+        return [fresh.get_subject_group(subject, mapping) for subject in subjects]
+
+    def aggregate():
+        fresh = TimeTableCore()
+        return fresh.aggregate_school_data(store, fresh.classify_subjects(store, mapping))
+
+    def save():
+        return TimeTableCore().save_results(store, output_path, mapping)
+
+    _, *results["get_subject_group"] = measure(resolve_all, memory)
+    _, *results["aggregate_school_data"] = measure(aggregate, memory)
+    _, *results["save_results"] = measure(save, memory)
+    return results
+
+
+def run_benchmark_quietly(*args, **kwargs):
+    """run_benchmark를 neis 로거 출력 없이 실행
+
+    처리 중 경고(매핑되지 않은 과목 요약 등)가 핸들러 없이 stderr로 나가
+    결과 표 사이에 섞이지 않도록 측정하는 동안 NullHandler를 붙입니다.
+    """
+    handler = add_log_handler(logging.NullHandler(), logging.WARNING)
+    try:
+        return run_benchmark(*args, **kwargs)
+    finally:
+        remove_log_handler(handler)
+
+
+def measure_import(module, repeat=5):
+    """새 인터프리터에서 module import 시간(초)을 repeat번 재어 최솟값과 함께 로드된 지연 대상 모듈 반환"""
+    code = IMPORT_PROBE.format(module=module, deferred=DEFERRED_MODULES)
+    best, loaded = None, []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.split()
+        elapsed, loaded = float(output[0]), output[1:]
+        best = elapsed if best is None else min(best, elapsed)
+    return best, loaded
+
+
+def check_imports(repeat=5):
+    """모듈별 import 시간을 예산과 비교하여 (모듈, 밀리초, 예산, 로드된 지연 대상 모듈) 목록 반환"""
+    results = []
+    for module, budget in IMPORT_BUDGETS_MS.items():
+        elapsed, loaded = measure_import(module, repeat)
+        results.append((module, elapsed * 1000, budget, loaded))
+    return results
+
+
+def reference_subject_group(core, subject_name, mapping):
+    """인덱스 없이 매핑 키를 순서대로 훑는 기준 분류 (SubjectGroupResolver 도입 전 동작)"""
+    if not subject_name:
+        return '기타'
+    original_key = subject_name.lstrip('*')
+    if original_key in mapping:
+        return mapping[original_key]
+    normalized_key = core.normalize_subject_name(subject_name)
+    if normalized_key in mapping:
+        return mapping[normalized_key]
+    for key, group in mapping.items():
+        if normalized_key in key or key in normalized_key:
+            return group
+    return '기타'
+
+
+def check_resolver(mapping, seed=0):
+    """빈 매핑/작은 매핑/전체 매핑에서 분류 결과를 기준 분류와 비교하여 (매핑, 과목, 기대값, 결과) 불일치 목록 반환"""
+    subjects = RESOLVER_CHECK_SUBJECTS + subject_pool(mapping, 300, random.Random(seed))
+    mismatches = []
+    for label, check_mapping in RESOLVER_CHECK_MAPPINGS + [("전체 매핑", mapping)]:
+        core = TimeTableCore()
+        for subject in subjects:
+            expected = reference_subject_group(core, subject, check_mapping)
+            try:
+                actual = core.get_subject_group(subject, check_mapping)
+            except Exception as e:
+                actual = f"오류: {e!r}"
+            if actual != expected:
+                mismatches.append((label, subject, expected, actual))
+    return mismatches
+
+
+def report_resolver(mapping, seed=0):
+    """분류 불일치를 출력하고 불일치가 있으면 1 반환"""
+    mismatches = check_resolver(mapping, seed)
+    for label, subject, expected, actual in mismatches:
+        print(f"{label}: '{subject}' -> 기대 '{expected}', 결과 '{actual}'")
+    print(f"교과(군) 분류 확인: 불일치 {len(mismatches)}건")
+    return 1 if mismatches else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m neisBench",
+        description="합성 NEIS 시수배정현황 파일로 처리 단계별 시간과 최대 메모리를 측정합니다."
+    )
+    parser.add_argument("--schools", type=int, nargs="+", default=[1, 50, 500],
+                        help="측정할 학교(파일) 수 목록 (기본값: 1 50 500)")
+    parser.add_argument("--teachers", type=int, default=40, help="학교당 교사 수 (기본값: 40)")
+    parser.add_argument("--subjects", type=int, default=120, help="학교당 과목 종류 수 (기본값: 120)")
+    parser.add_argument("--sheets", type=int, default=3, help="파일당 시트 수 (기본값: 3)")
+    parser.add_argument("--seed", type=int, default=0, help="합성 데이터 난수 시드 (기본값: 0)")
+    parser.add_argument("--mapping", default=DEFAULT_MAPPING_FILE,
+                        help=f"교과(군) 매핑 JSON 경로 (기본값: {DEFAULT_MAPPING_FILE})")
+    parser.add_argument("--workdir", default=os.path.join(tempfile.gettempdir(), "neis_bench"),
+                        help="합성 파일과 결과 파일을 둘 폴더 (같은 설정이면 파일 재사용)")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="최대 메모리 측정 생략 (단계를 한 번씩만 실행)")
+    parser.add_argument("--json", metavar="PATH", help="측정 결과를 JSON으로 저장할 경로")
+    parser.add_argument("--imports", action="store_true",
+                        help="단계 측정 대신 모듈 import 시간을 재어 예산과 비교 (초과 시 종료 코드 1)")
+    parser.add_argument("--check-resolver", action="store_true",
+                        help="단계 측정 대신 교과(군) 분류를 순차 탐색 결과와 비교 (불일치 시 종료 코드 1)")
+    return parser
+
+
+def report_imports():
+    """import 시간 표를 출력하고 예산 초과나 지연 대상 모듈 로드가 있으면 1 반환"""
+    failed = False
+    print(f"{'모듈':<16} {'시간(ms)':>10} {'예산(ms)':>10}  결과")
+    for module, elapsed, budget, loaded in check_imports():
+        problems = []
+        if elapsed > budget:
+            problems.append("예산 초과")
+        if loaded:
+            problems.append("시작 시 로드: " + ", ".join(loaded))
+        failed = failed or bool(problems)
+        print(f"{module:<16} {elapsed:>10.1f} {budget:>10}  {'; '.join(problems) or '통과'}")
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.imports:
+        return report_imports()
+
+    with open(args.mapping, 'r', encoding='utf-8-sig') as f:
+        mapping = json.load(f)
+    if args.check_resolver:
+        return report_resolver(mapping, args.seed)
+
+    report = []
+    print(f"{'학교 수':>6}  {'단계':<22} {'시간(초)':>10} {'최대 메모리(MB)':>16}")
+    for schools in args.schools:
+        out_dir = os.path.join(args.workdir, f"s{schools}_t{args.teachers}_j{args.subjects}"
+                                             f"_h{args.sheets}_seed{args.seed}")
+        file_paths = generate_exports(out_dir, schools, mapping, args.seed, args.subjects,
+                                      teachers=args.teachers, sheets=args.sheets)
+        results = run_benchmark_quietly(file_paths, args.mapping, os.path.join(out_dir, "결과집계표.xlsx"),
+                                        memory=not args.no_memory)
+        for stage in STAGES:
+            elapsed, peak = results[stage]
+            peak_text = f"{peak / 1024 / 1024:16.1f}" if peak is not None else f"{'-':>16}"
+            print(f"{schools:>6}  {stage:<22} {elapsed:>10.3f} {peak_text}")
+            report.append({'schools': schools, 'stage': stage, 'seconds': elapsed, 'peak_bytes': peak})
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'settings': {key: value for key, value in vars(args).items() if key != 'json'},
+                       'results': report}, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
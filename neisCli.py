@@ -0,0 +1,135 @@
+"""시수배정현황 일괄 처리 (헤드리스 CLI)
+
+Tkinter 없이 추출 → 병합 → 분류 → 저장을 수행합니다.
+
+사용 예:
+    python -m neisCli "exports/*.xlsx" --mode multi --output 결과집계표.xlsx
+    python -m neisCli exports --watch --mode multi    # 폴더 감시 (새 파일이 들어오면 다시 집계)
+"""
+import argparse
+import glob
+import logging
+import os
+import sys
+
+from neisCore import (TimeTableCore, ExtractionCache, DEFAULT_MAPPING_FILE, DEFAULT_OUTPUT_FILE,
+                      DEFAULT_WORKERS, DEFAULT_CACHE_DIR, add_log_handler, add_debug_log_file)
+from neisExport import EXPORT_FORMATS
+from neisWatch import FolderWatcher, DEFAULT_WATCH_INTERVAL, DEFAULT_WATCH_DEBOUNCE, watch
+
+
+def expand_inputs(patterns):
+    """입력 경로/글롭 패턴을 실제 파일 목록으로 변환 (순서 유지, 중복 제거)"""
+    file_paths = []
+    seen = set()
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) or ([pattern] if os.path.isfile(pattern) else [])
+        for path in matches:
+            key = os.path.abspath(path)
+            if key not in seen:
+                seen.add(key)
+                file_paths.append(path)
+    return file_paths
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m neisCli",
+        description="NEIS 시수배정현황 파일을 집계하여 결과집계표를 생성합니다."
+    )
+    parser.add_argument("inputs", nargs="+",
+                        help="시수배정현황 xlsx 파일 경로 또는 글롭 패턴 (예: 'exports/*.xlsx'), "
+                             "--watch에서는 감시할 폴더")
+    parser.add_argument("--mode", choices=["single", "multi"], default="single",
+                        help="single: 단일 학교 (파일 합침), multi: 학교별 통계 (기본값: single)")
+    parser.add_argument("--mapping", default=DEFAULT_MAPPING_FILE,
+                        help=f"교과(군) 매핑 JSON 경로 (기본값: {DEFAULT_MAPPING_FILE})")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT_FILE,
+                        help=f"결과 xlsx 경로 (기본값: {DEFAULT_OUTPUT_FILE})")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"파일 파싱에 사용할 프로세스 수 (기본값: CPU 코어 수 {DEFAULT_WORKERS})")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help=f"파일별 추출 결과 캐시 폴더 (기본값: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="추출 결과 캐시를 사용하지 않고 모든 파일을 다시 파싱")
+    parser.add_argument("--debug-log", metavar="PATH",
+                        help="행 단위 상세 로그를 기록할 파일 경로")
+    parser.add_argument("--export", nargs="+", choices=EXPORT_FORMATS, default=[], metavar="FORMAT",
+                        help="결과 xlsx와 함께 저장할 추가 형식: csv, sqlite, parquet(pyarrow 필요)")
+    parser.add_argument("--formulas", action="store_true",
+                        help="학교통계 시트에 계산값 대신 검증용 수식을 기록")
+    parser.add_argument("--cprofile", metavar="PATH",
+                        help="cProfile 결과(.prof)를 저장할 경로 (파싱 작업 프로세스 제외)")
+    parser.add_argument("--watch", action="store_true",
+                        help="입력 폴더를 감시하며 '(학교명)' 파일이 추가/변경/삭제될 때마다 다시 집계 (Ctrl+C로 종료)")
+    parser.add_argument("--interval", type=float, default=DEFAULT_WATCH_INTERVAL,
+                        help=f"--watch 폴더 확인 간격(초) (기본값: {DEFAULT_WATCH_INTERVAL:g})")
+    parser.add_argument("--debounce", type=float, default=DEFAULT_WATCH_DEBOUNCE,
+                        help=f"--watch 마지막 변경 후 처리까지 기다릴 시간(초) (기본값: {DEFAULT_WATCH_DEBOUNCE:g})")
+    parser.add_argument("--quiet", action="store_true",
+                        help="경고와 오류만 출력")
+    parser.add_argument("--verbose", action="store_true",
+                        help="과목 분류/정규화 과정 등 디버그 로그도 콘솔에 출력")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.watch and args.no_cache:
+        parser.error("--watch는 바뀐 파일만 다시 파싱하기 위해 추출 결과 캐시를 사용하므로 --no-cache와 함께 쓸 수 없습니다.")
+    console_level = logging.DEBUG if args.verbose else logging.WARNING if args.quiet else logging.INFO
+    add_log_handler(logging.StreamHandler(sys.stdout), console_level)
+    if args.debug_log:
+        add_debug_log_file(args.debug_log)
+
+    if args.watch:
+        return watch_folders(args)
+
+    file_paths = expand_inputs(args.inputs)
+    if not file_paths:
+        print("입력 파일을 찾을 수 없습니다.", file=sys.stderr)
+        return 2
+    if not os.path.exists(args.mapping):
+        print(f"교과(군) 매핑 파일을 찾을 수 없습니다: {args.mapping}", file=sys.stderr)
+        return 2
+
+    saved_path = run(TimeTableCore(), file_paths, args, None if args.no_cache else ExtractionCache(args.cache_dir))
+    return 0 if saved_path else 1
+
+
+def run(core, file_paths, args, cache):
+    """명령행 옵션으로 전체 처리를 한 번 실행하고 저장된 결과 파일 경로 반환"""
+    return core.run_pipeline(file_paths,
+                             single_mode=args.mode == "single",
+                             mapping_path=args.mapping,
+                             output_path=os.path.abspath(args.output),
+                             workers=max(1, args.workers),
+                             stats_formulas=args.formulas,
+                             cache=cache,
+                             cprofile_path=args.cprofile,
+                             export_formats=args.export)
+
+
+def watch_folders(args):
+    """입력 폴더를 감시하며 변경이 있을 때마다 다시 집계 (매핑과 캐시는 실행 간 재사용)"""
+    directories = [path for path in args.inputs if os.path.isdir(path)]
+    missing = [path for path in args.inputs if not os.path.isdir(path)]
+    if missing:
+        print(f"감시할 폴더를 찾을 수 없습니다: {', '.join(missing)}", file=sys.stderr)
+        return 2
+    if not os.path.exists(args.mapping):
+        print(f"교과(군) 매핑 파일을 찾을 수 없습니다: {args.mapping}", file=sys.stderr)
+        return 2
+
+    core = TimeTableCore()
+    cache = ExtractionCache(args.cache_dir)
+    # 결과 파일을 감시 폴더에 저장하는 경우 결과 파일(및 '(2)' 대체 이름)은 입력에서 제외
+    output_prefix = os.path.splitext(os.path.basename(args.output))[0]
+    watcher = FolderWatcher(directories, debounce=args.debounce, exclude_prefixes=[output_prefix])
+    watch(watcher, lambda file_paths: run(core, file_paths, args, cache), interval=args.interval)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1801 @@
+"""시수배정현황 처리 코어 (Tkinter 없이 동작)
+
+추출 → 병합 → 분류 → 저장 단계를 GUI와 분리하여 헤드리스 환경(배치/CLI)에서도
+그대로 사용할 수 있도록 한 모듈입니다. GUI(neisToxlsx_new.py)는 이 클래스를
+상속하여 로그 출력과 진행 표시만 화면에 연결합니다.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import time
+import zlib
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from contextlib import contextmanager
+from copy import copy
+from functools import lru_cache, partial
+from itertools import combinations
+from unicodedata import east_asian_width
+
+# openpyxl(차트/드로잉 모듈 포함), concurrent.futures, subprocess, sqlite3 등 무거운 모듈은
+# 시작 시간을 줄이기 위해 해당 단계가 실행될 때 함수 안에서 가져옵니다.
+
+# 프로그램이 있는 디렉터리 (실행 파일로 배포된 경우 실행 파일 위치) - 작업 디렉터리와 무관
+APP_DIR = os.path.dirname(os.path.abspath(sys.executable if getattr(sys, 'frozen', False) else __file__))
+DEFAULT_MAPPING_FILE = os.path.join(APP_DIR, "subject_group_mapping.json")
+DEFAULT_OUTPUT_FILE = "결과집계표.xlsx"
+DEFAULT_WORKERS = os.cpu_count() or 1
+DEFAULT_DEBUG_LOG_FILE = "neis_debug.log"
+
+# 결과 시트 공통 이름 있는 스타일
+HEADER_STYLE = "neis_header"
+HEADER_LEFT_STYLE = "neis_header_left"
+CELL_STYLE = "neis_cell"
+CELL_LEFT_STYLE = "neis_cell_left"
+# 학교통계 시트: 수식 셀 배경색, 고정 열 너비 (A열 학교명은 넉넉하게, B열은 비고 등 짧은 값)
+FORMULA_FILL_COLOR = 'FFF2CC'
+STATS_FIXED_WIDTHS = {1: 40, 2: 20}
+
+LOG_FORMAT = "[%(asctime)s] %(message)s"
+LOG_DATEFMT = "%Y-%m-%d %H:%M:%S"
+
+# 병렬 처리 중 취소 요청을 확인하는 간격 (초)
+CANCEL_POLL_INTERVAL = 0.2
+
+# 컴파일된 매핑 캐시 - 매핑 JSON 옆에 저장하며 JSON 내용 해시가 바뀌면 다시 만듦
+# (다른 사용자가 둔 파일일 수 있으므로 코드 실행이 없는 JSON으로 저장)
+MAPPING_CACHE_SUFFIX = ".cache"
+MAPPING_CACHE_VERSION = 2
+
+# 파일별 추출 결과 캐시 - 파일 내용 해시와 추출기 버전으로 식별
+# (추출 결과나 저장 형식이 달라지는 변경을 하면 EXTRACTOR_VERSION을 올려 기존 캐시를 무효화)
+EXTRACTOR_VERSION = 3
+DEFAULT_CACHE_DIR = os.path.join(APP_DIR, ".neis_cache")
+DEFAULT_CACHE_MAX_ENTRIES = 1000
+DEFAULT_CACHE_MAX_BYTES = 200 * 1024 * 1024
+CACHE_ENTRY_SUFFIX = ".records"
+
+# 결과 시트 헤더
+DETAIL_HEADERS = ['학교명', '교사명', '과목', '총시수', '교과(군)']
+SUMMARY_HEADERS = ['학교명', '교사명', '담당교과', '총시수', '담당과목 수', '담당과목명', '교과(군)조합']
+COMBINATION_HEADERS = ['학교명', '교과(군) 조합', '교사수', '해당 교사명']
+
+# 시트 읽기 범위 - 앞쪽 HEADER_PROBE_ROWS 행에 '총시수' 헤더가 없으면 시트를 건너뛰고,
+# 데이터 영역에서 빈 행이 EMPTY_ROW_LIMIT 행 연속되면 서식만 남은 영역으로 보고 중단
+HEADER_PROBE_ROWS = 100
+EMPTY_ROW_LIMIT = 100
+# 실행이 끝날 때 요약에 이름을 보여 줄 매핑되지 않은 과목 수 (건수가 많은 순)
+UNMATCHED_SUMMARY_LIMIT = 20
+
+# 단계별 소요 시간 요약 파일 (결과 파일 옆에 '<결과 파일명>.timing.json'으로 저장)
+TIMING_SUFFIX = ".timing.json"
+STAGE_LABELS = {
+    'load_mapping': "매핑 로드",
+    'cache_lookup': "캐시 조회",
+    'open_workbook': "파일 열기",
+    'extract': "데이터 추출",
+    'classify': "교과(군) 분류",
+    'aggregate': "집계",
+    'write_teacher_sheets': "교사 시트 작성",
+    'school_stats': "학교통계(차트 포함)",
+    'write_combinations': "교과군조합 작성",
+    'save_workbook': "파일 저장",
+    'export': "추가 형식 출력",
+}
+
+# 과목명 정규화 규칙: 끝에 붙은 숫자, 로마숫자, 괄호, 레벨 표시를 이 순서로 한 번씩 제거
+# (규칙마다 re.sub를 적용하던 것과 같은 결과를 한 번의 매칭으로 계산 - 가장 짧은 앞부분이 과목명)
+SUBJECT_SUFFIX_PATTERN = re.compile(
+    r'(.*?)'
+    r'(?:\s+(?:A|B|C|고급|중급|초급|기초|심화))?\s*'  # 레벨 표시
+    r'(?:\([^)]*\))?\s*'  # 괄호 내용
+    r'[ⅠⅡⅢⅣⅤⅥⅦⅧⅨⅩ]*\s*'  # 로마숫자
+    r'\d*',  # 숫자
+    re.DOTALL)
+# 과목명 정규화 결과 메모 크기 (학교마다 같은 과목명 수백 개가 반복됨)
+NORMALIZE_CACHE_SIZE = 4096
+
+# 교과(군) 필터링 규칙: 두 교과(군)을 함께 담당하면 하나로 표시 (앞에 있는 규칙 우선)
+GROUP_FILTER_RULES = [
+    (('과학', '기술·가정'), '과학'),
+    (('과학', '기술∙가정'), '과학'),
+    (('보건', '기술·가정'), '기술∙가정'),
+    (('제2외국어', '한문'), '제2외국어'),
+    (('수학', '정보'), '수학'),
+    (('과학', '보건'), '과학'),
+    (('한문', '보건'), '한문'),
+    (('국어', '한문'), '국어'),
+    (('영어', '예술'), '영어'),
+    (('사회', '예술'), '사회'),
+    (('과학', '정보'), '과학'),
+    (('예술', '제2외국어'), '예술'),
+    (('정보', '기술·가정'), '정보'),
+    (('수학', '기술·가정'), '수학'),
+    (('영어', '기술·가정'), '영어'),
+    (('국어', '보건'), '국어'),
+    (('수학', '보건'), '수학'),
+    (('영어', '보건'), '영어'),
+    (('예술', '보건'), '예술'),
+    (('국어', '전문 교과'), '국어'),
+    (('수학', '전문 교과'), '수학'),
+    (('영어', '전문 교과'), '영어'),
+    (('예술', '전문 교과'), '예술'),
+    (('진로', '전문 교과'), '전문 교과'),
+    (('제2외국어', '보건'), '제2외국어'),
+]
+# 교과(군) 쌍 -> (우선순위, 결과) (같은 쌍이 여러 번 있으면 앞의 규칙 유지)
+GROUP_FILTER_INDEX = {frozenset(pair): (priority, result)
+                      for priority, (pair, result) in reversed(list(enumerate(GROUP_FILTER_RULES)))}
+# 다른 교과(군)이 있으면 제외하는 교과(군)
+GROUP_FILTER_MINOR = ('교양', '기타')
+GROUP_FILTER_VOCATIONAL = ('전문 교과', '진로')
+
+logger = logging.getLogger("neis")
+
+
+@lru_cache(maxsize=None)
+def filter_group_set(groups):
+    """교과(군) 집합(frozenset)에 필터링 규칙을 적용한 결과 (정렬된 튜플, 집합별로 한 번만 계산)
+
+    규칙은 교과(군) 쌍으로 색인되어 있으므로 집합 안의 쌍만 찾아보고, 일치하는 규칙
+    중 우선순위가 가장 높은 규칙을 적용합니다.
+    """
+    logger.debug("처리 전 교과군: %s", sorted(groups))
+    filtered = set(groups)
+
+    # 교양, 기타 처리
+    other_subjects = {subj for subj in filtered if subj not in GROUP_FILTER_MINOR}
+    if other_subjects:
+        filtered = other_subjects
+
+    # 규칙 적용
+    matches = [GROUP_FILTER_INDEX[pair] for pair in map(frozenset, combinations(filtered, 2))
+               if pair in GROUP_FILTER_INDEX]
+    if matches:
+        priority, result = min(matches)
+        filtered = {result}
+        logger.debug("규칙 적용됨: %s -> %s", GROUP_FILTER_RULES[priority][0], result)
+
+    # 전문 교과, 진로 처리
+    if any(x in filtered for x in GROUP_FILTER_VOCATIONAL):
+        other_subjects = {x for x in filtered if x not in GROUP_FILTER_VOCATIONAL}
+        if other_subjects:
+            filtered = other_subjects
+            logger.debug("전문 교과/진로 규칙 적용됨")
+
+    result = tuple(sorted(filtered))
+    logger.debug("처리 후 교과군: %s", list(result))
+    return result
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def normalize_subject(subject_name):
+    """과목명 정규화 - '*'와 끝에 붙은 숫자/로마숫자/괄호/레벨 표시를 제거한 매칭용 키
+
+    (예: "수학1", "수학Ⅰ", "수학(미적분)", "수학 A" -> "수학")
+    결과는 프로세스 안에서 공유하는 LRU 메모에 보관합니다 (normalize_subject.cache_info()로 적중률 확인).
+    """
+    stripped = subject_name.lstrip('*').strip()
+    normalized = SUBJECT_SUFFIX_PATTERN.fullmatch(stripped).group(1).strip()
+    if normalized != stripped:
+        logger.debug("과목명 정규화: '%s' -> '%s'", subject_name, normalized)
+    return normalized
+
+
+class ProcessingCancelled(Exception):
+    """사용자가 처리를 취소했을 때 발생"""
+
+
+class PipelineProfile:
+    """처리 단계별/파일별 소요 시간과 건수 기록 (타이밍 요약 JSON의 원본)
+
+    병렬 처리에서는 작업 프로세스의 기록을 merge로 합치므로 파일 단계(open_workbook,
+    extract) 시간은 프로세스별 시간의 합계이며 전체 경과 시간보다 클 수 있습니다.
+    """
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.stages = {}  # 단계명 -> 누적 초 (처음 기록한 순서 유지)
+        self.counters = {}  # 항목명 -> 건수
+        self.files = []  # 파일별 {'file', 'seconds', 'records', 'cached'}
+
+    @contextmanager
+    def stage(self, name):
+        """with 블록의 실행 시간을 단계 시간에 누적"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def add_time(self, name, seconds):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def merge(self, other):
+        """다른 프로세스에서 만든 기록 합치기"""
+        for name, seconds in other.stages.items():
+            self.add_time(name, seconds)
+        for name, amount in other.counters.items():
+            self.count(name, amount)
+        self.files.extend(other.files)
+
+    def summary(self):
+        """JSON으로 저장할 요약 딕셔너리"""
+        return {
+            'total_seconds': round(time.perf_counter() - self.started_at, 4),
+            'stages': {name: round(seconds, 4) for name, seconds in self.stages.items()},
+            'counters': dict(self.counters),
+            'files': self.files,
+        }
+
+    def log_lines(self):
+        """상태 창에 표시할 요약 문장"""
+        stage_text = ", ".join(f"{STAGE_LABELS.get(name, name)} {seconds:.2f}초"
+                               for name, seconds in sorted(self.stages.items(), key=lambda kv: -kv[1]))
+        counter_text = ", ".join(f"{name} {amount:,}" for name, amount in self.counters.items())
+        return [
+            f"총 소요 시간 {time.perf_counter() - self.started_at:.2f}초 - 단계별: {stage_text}",
+            f"처리 건수: {counter_text}",
+        ]
+
+
+def add_log_handler(handler, level=logging.INFO):
+    """진행 로그를 받을 핸들러(콘솔, GUI 상태 창 등) 등록"""
+    handler.setLevel(level)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT, LOG_DATEFMT))
+    logger.addHandler(handler)
+    if not logger.level or logger.level > level:
+        logger.setLevel(level)
+    return handler
+
+
+def add_debug_log_file(path=DEFAULT_DEBUG_LOG_FILE):
+    """행 단위 상세 로그(DEBUG)를 기록할 파일 핸들러 등록"""
+    return add_log_handler(logging.FileHandler(path, encoding='utf-8'), logging.DEBUG)
+
+
+def remove_log_handler(handler):
+    """등록한 핸들러를 해제하고, 남은 핸들러 기준으로 로그 레벨 재설정"""
+    logger.removeHandler(handler)
+    handler.close()
+    logger.setLevel(min((h.level for h in logger.handlers), default=logging.INFO))
+
+
+def parse_school_name(file_path, single_mode=False):
+    """파일명의 괄호 안 내용에서 학교명 추출 ('xx고' -> 'xx고등학교')"""
+    if single_mode:
+        return "단일학교"
+    filename = os.path.basename(file_path)
+    school_match = re.search(r'\((.*?)\)', filename)
+    school_name = school_match.group(1) if school_match else "알수없음"
+    # 학교명 수정 ('xx고'를 'xx고등학교'로)
+    if school_name.endswith('고'):
+        school_name = school_name[:-1] + '고등학교'
+    return school_name
+
+
+@lru_cache(maxsize=65536)
+def display_width(text):
+    """문자열의 표시 폭 (한글 등 전각 문자는 2칸으로 계산)"""
+    if text.isascii():
+        return len(text)
+    return sum(2 if east_asian_width(char) in 'WF' else 1 for char in text)
+
+
+def fit_widths(widths, values):
+    """한 행의 값으로 열별 최대 표시 폭 목록(widths)을 갱신"""
+    for idx, value in enumerate(values):
+        if value is not None:
+            width = display_width(str(value))
+            if width > widths[idx]:
+                widths[idx] = width
+
+
+class RecordStore:
+    """추출 레코드의 열 단위 저장소
+
+    학교/교사/과목은 문자열을 한 번만 보관하고 행에는 정수 코드만 배열로 저장하며,
+    총시수도 정수 배열로 보관합니다. 학교 코드는 학교명마다 하나이므로 같은 학교의
+    파일이 여러 개여도 한 학교로 합쳐집니다.
+    (학교, 교사, 과목) 코드 -> 행 번호 색인을 두어 파일을 추가할 때마다 바로 중복을
+    합치며, 같은 키가 다시 나오면 총시수가 큰 쪽을 남깁니다(파일 내 중복 제거와 같은 규칙).
+    sum_by/distinct_by는 열 배열을 한 번 훑어 키별 결과를 만들며(키는 열이 하나면
+    코드, 여러 개면 코드 튜플), 결과 딕셔너리는 키가 처음 나온 순서를 유지합니다.
+    """
+
+    def __init__(self):
+        self.school_names = []  # 학교 코드 -> 학교명
+        self.teachers = []  # 교사 코드 -> 교사명
+        self.subjects = []  # 과목 코드 -> 과목명
+        self._school_codes = {}
+        self._teacher_codes = {}
+        self._subject_codes = {}
+        self._rows = {}  # (학교, 교사, 과목) 코드 -> 행 번호
+        self.merged = 0  # 이미 있는 키와 합쳐진 레코드 수
+        self.school = array('i')
+        self.teacher = array('i')
+        self.subject = array('i')
+        self.hours = array('q')
+
+    def __len__(self):
+        return len(self.hours)
+
+    def add_school(self, school_name):
+        """학교명의 학교 코드 반환 (처음 나온 학교명이면 새로 발급)"""
+        return self.intern(self.school_names, self._school_codes, school_name)
+
+    def intern(self, values, codes, value):
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(values)
+            values.append(value)
+        return code
+
+    def extend(self, school_code, records):
+        """(과목, 교사명, 총시수) 레코드를 학교 코드로 추가하고 합쳐진 중복 수 반환
+
+        (학교, 교사, 과목)이 이미 있으면 행을 늘리지 않고 총시수만 큰 값으로 갱신합니다.
+        """
+        rows, hours_column = self._rows, self.hours
+        merged = 0
+        for subject, teacher, hours in records:
+            teacher_code = self.intern(self.teachers, self._teacher_codes, teacher)
+            subject_code = self.intern(self.subjects, self._subject_codes, subject)
+            key = (school_code, teacher_code, subject_code)
+            row = rows.get(key)
+            if row is not None:
+                merged += 1
+                if hours > hours_column[row]:
+                    hours_column[row] = hours
+                continue
+            rows[key] = len(hours_column)
+            self.school.append(school_code)
+            self.teacher.append(teacher_code)
+            self.subject.append(subject_code)
+            hours_column.append(hours)
+        self.merged += merged
+        return merged
+
+    @staticmethod
+    def keys(columns):
+        return columns[0] if len(columns) == 1 else zip(*columns)
+
+    def sum_by(self, *columns, values=None):
+        """키별 합계 (기본값은 총시수)"""
+        totals = {}
+        for key, value in zip(self.keys(columns), self.hours if values is None else values):
+            totals[key] = totals.get(key, 0) + value
+        return totals
+
+    def distinct_by(self, *columns, values):
+        """키별 values 열의 서로 다른 코드 집합"""
+        distinct = {}
+        for key, value in zip(self.keys(columns), values):
+            codes = distinct.get(key)
+            if codes is None:
+                codes = distinct[key] = set()
+            codes.add(value)
+        return distinct
+
+
+def init_worker(debug_log_paths):
+    """프로세스 풀 작업자 초기화 - 상위 프로세스의 상세 로그 파일에 이어서 기록"""
+    # fork 방식에서는 상위 프로세스의 핸들러(GUI 큐 등)가 복제되므로 먼저 정리
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    for path in debug_log_paths:
+        add_debug_log_file(path)
+
+
+def open_workbook(file_path):
+    """추출용 워크북 열기 - 셀 객체와 스타일을 메모리에 올리지 않는 읽기 전용 모드"""
+    import openpyxl
+    return openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+
+
+def extract_file(file_path):
+    """파일 하나를 파싱하여 (압축 레코드, 처리 기록) 반환 (프로세스 풀 작업 단위)"""
+    core = TimeTableCore()
+    return core.parse_file(file_path), core.profile
+
+
+class ExtractionCache:
+    """파일별 추출 결과(process_workbook 결과) 디스크 캐시
+
+    키는 파일 내용의 SHA-256과 EXTRACTOR_VERSION으로 만들므로 파일 이름이나
+    위치가 바뀌어도 내용이 같으면 재사용됩니다. 항목은 사용할 때마다 수정 시각을
+    갱신하고, evict()에서 오래 사용하지 않은 항목부터 지워 개수/용량 한도를 지킵니다.
+    항목은 zlib으로 압축한 JSON이므로(--cache-dir이 공유 폴더여도 코드가 실행되지
+    않음) 읽을 때 레코드 형태를 확인하고, 맞지 않으면 손상된 항목으로 보고 지웁니다.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_entries=DEFAULT_CACHE_MAX_ENTRIES,
+                 max_bytes=DEFAULT_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+    def key_for(self, file_path):
+        """파일 내용과 추출기 버전으로 캐시 키 생성"""
+        digest = hashlib.sha256(f"v{EXTRACTOR_VERSION}:".encode())
+        with open(file_path, 'rb') as f:
+            for chunk in iter(partial(f.read, 1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def entry_path(self, key):
+        return os.path.join(self.cache_dir, key + CACHE_ENTRY_SUFFIX)
+
+    @staticmethod
+    def encode(records):
+        return zlib.compress(json.dumps(records, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+    @staticmethod
+    def decode(data):
+        """압축된 JSON을 (과목, 교사명, 총시수) 튜플 리스트로 변환 (형태가 다르면 ValueError)"""
+        records = []
+        for subject, teacher, hours in json.loads(zlib.decompress(data).decode('utf-8')):
+            if not (isinstance(subject, str) and isinstance(teacher, str)
+                    and isinstance(hours, (int, float)) and not isinstance(hours, bool)):
+                raise ValueError("잘못된 레코드 형식")
+            records.append((subject, teacher, hours))
+        return records
+
+    def get(self, key):
+        """캐시된 레코드 반환 (없거나 읽을 수 없으면 None)"""
+        path = self.entry_path(key)
+        try:
+            with open(path, 'rb') as f:
+                records = self.decode(f.read())
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.debug("추출 캐시 항목을 읽지 못해 삭제합니다: %s (%s)", path, e)
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        try:
+            os.utime(path)  # 최근 사용 시각 갱신 (LRU)
+        except OSError:
+            pass
+        return records
+
+    def put(self, key, records):
+        """레코드를 캐시에 저장 (저장할 수 없으면 조용히 건너뜀)"""
+        path = self.entry_path(key)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(temp_path, 'wb') as f:
+                f.write(self.encode(records))
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.debug("추출 캐시를 저장하지 못했습니다: %s (%s)", path, e)
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def evict(self):
+        """개수/용량 한도를 넘으면 가장 오래 사용하지 않은 항목부터 삭제"""
+        try:
+            entries = [entry for entry in os.scandir(self.cache_dir)
+                       if entry.name.endswith(CACHE_ENTRY_SUFFIX) and entry.is_file()]
+        except FileNotFoundError:
+            return
+        stats = sorted(((entry.stat().st_mtime, entry.stat().st_size, entry.path) for entry in entries),
+                       reverse=True)
+        count = total_bytes = 0
+        for _, size, path in stats:
+            count += 1
+            total_bytes += size
+            if count > self.max_entries or total_bytes > self.max_bytes:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+def mapping_cache_path(json_path):
+    """매핑 JSON에 대응하는 컴파일된 매핑 캐시 파일 경로"""
+    return json_path + MAPPING_CACHE_SUFFIX
+
+
+def load_compiled_mapping(json_path):
+    """매핑 JSON을 읽어 (내용 해시, 매핑, 분류기 색인) 반환
+
+    JSON 옆의 캐시 파일이 같은 버전과 해시로 만들어진 것이면 색인 생성을
+    건너뛰고, 아니면 새로 만들어 캐시 파일을 갱신합니다. 캐시 파일은 JSON으로
+    읽으므로 내용과 관계없이 코드가 실행되지 않으며, 버전/해시/형태를 확인한
+    뒤에만 사용합니다.
+    """
+    with open(json_path, 'rb') as f:
+        raw = f.read()
+    digest = hashlib.sha256(raw).hexdigest()
+
+    cache_path = mapping_cache_path(json_path)
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            artifact = json.load(f)
+        if (isinstance(artifact, dict) and artifact.get('version') == MAPPING_CACHE_VERSION
+                and artifact.get('sha256') == digest
+                and isinstance(artifact.get('mapping'), dict) and isinstance(artifact.get('index'), dict)):
+            return digest, artifact['mapping'], artifact['index']
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.debug("매핑 캐시를 읽지 못해 다시 만듭니다: %s (%s)", cache_path, e)
+
+    # BOM 제거를 위해 utf-8-sig 사용
+    mapping = json.loads(raw.decode('utf-8-sig'))
+    index = SubjectGroupResolver.build_index(mapping)
+    artifact = {'version': MAPPING_CACHE_VERSION, 'sha256': digest, 'mapping': mapping, 'index': index}
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(artifact, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        # 읽기 전용 위치 등 - 캐시 없이 계속 진행
+        logger.debug("매핑 캐시를 저장하지 못했습니다: %s (%s)", cache_path, e)
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return digest, mapping, index
+
+
+class SubjectGroupResolver:
+    """과목명 → 교과(군) 분류기
+
+    매핑으로부터 한 번만 색인을 만들고, 과목명별 결과를 메모하여 같은 과목은
+    다시 계산하지 않습니다. 매칭 순서와 결과는 기존 get_subject_group과 같습니다.
+    1. 원본 이름('*' 제거) 정확히 일치
+    2. 정규화된 이름 정확히 일치
+    3. 부분 일치 - 정규화된 이름이 키에 포함되거나 키가 정규화된 이름에 포함되는
+       매핑 키 중 매핑 파일에서 가장 앞선 키
+    """
+
+    SEPARATOR = '\n'
+
+    def __init__(self, mapping, normalize, index=None):
+        self.mapping = mapping
+        self.normalize = normalize
+        if index is None:
+            index = self.build_index(mapping)
+        self.groups = index['groups']
+        self._keys = index['keys']
+        self._key_order = index['key_order']
+        self._max_key_len = index['max_key_len']
+        self._haystack = index['haystack']
+        self._offsets = index['offsets']
+        self._memo = {}
+        self.lookups = 0  # resolve 호출 수
+        self.memo_hits = 0  # 그중 메모에서 바로 찾은 수
+        self.unmatched = set()  # 매핑되지 않아 '기타'로 분류한 과목명
+
+    @classmethod
+    def build_index(cls, mapping):
+        """매핑 키 색인 생성 (매핑 캐시 파일에 그대로 저장됨)"""
+        keys = list(mapping)
+        key_order = {}
+        for idx, key in enumerate(keys):
+            key_order.setdefault(key, idx)
+        # 키를 매핑 순서대로 이어 붙인 문자열과 각 키의 시작 위치
+        # (첫 번째 검색 위치가 곧 그 이름을 포함하는 가장 앞선 키)
+        offsets = []
+        offset = 0
+        for key in keys:
+            offsets.append(offset)
+            offset += len(key) + len(cls.SEPARATOR)
+        return {
+            'groups': sorted(set(mapping.values())),
+            'keys': keys,
+            'key_order': key_order,
+            'max_key_len': max(map(len, keys), default=0),
+            'haystack': cls.SEPARATOR.join(keys),
+            'offsets': offsets,
+        }
+
+    def resolve(self, subject_name):
+        """과목명의 교과(군) 반환 (결과 메모)"""
+        self.lookups += 1
+        try:
+            group = self._memo[subject_name]
+            self.memo_hits += 1
+            return group
+        except KeyError:
+            group = self._memo[subject_name] = self._lookup(subject_name)
+            return group
+
+    def _lookup(self, subject_name):
+        if not subject_name:
+            return '기타'
+            
+        # 1. 원본 이름으로 먼저 시도
+        original_key = subject_name.lstrip('*')
+        if original_key in self.mapping:
+            return self.mapping[original_key]
+        
+        # 2. 정규화된 이름으로 시도
+        normalized_key = self.normalize(subject_name)
+        if normalized_key in self.mapping:
+            logger.debug("정규화된 매칭 성공: '%s' -> '%s' -> '%s'",
+                         subject_name, normalized_key, self.mapping[normalized_key])
+            return self.mapping[normalized_key]
+        
+        # 3. 부분 매칭 시도 (정규화된 이름이 매핑 키에 포함되어 있는지)
+        key = self.find_partial_key(normalized_key)
+        if key is not None:
+            group = self.mapping[key]
+            logger.debug("부분 매칭 성공: '%s' -> '%s' -> '%s'", subject_name, key, group)
+            return group
+        
+        # 4. 매칭 실패시 기타로 분류 (실행이 끝날 때 과목별 건수로 한 번에 요약)
+        logger.debug("매칭 실패: '%s' (정규화: '%s') -> '기타'", subject_name, normalized_key)
+        self.unmatched.add(subject_name)
+        return '기타'
+
+    def find_partial_key(self, name):
+        """name이 키에 포함되거나 키가 name에 포함되는 매핑 키 중 가장 앞선 키 반환"""
+        if not self._keys:  # 매핑이 비어 있으면 (정규화 결과가 ''여도) 부분 매칭 없음
+            return None
+        best = None
+
+        # name을 포함하는 키: 이어 붙인 문자열에서 처음 나오는 위치의 키
+        if self.SEPARATOR not in name:
+            pos = self._haystack.find(name)
+            if pos >= 0:
+                best = bisect_right(self._offsets, pos) - 1
+
+        # name에 포함되는 키: name의 부분 문자열(최대 키 길이까지)을 키 색인에서 조회
+        candidates = [self._key_order.get('')]
+        for start in range(len(name)):
+            for end in range(start + 1, min(len(name), start + self._max_key_len) + 1):
+                candidates.append(self._key_order.get(name[start:end]))
+        for idx in candidates:
+            if idx is not None and (best is None or idx < best):
+                best = idx
+
+        return self._keys[best] if best is not None else None
+
+
+class TimeTableCore:
+    """시수배정현황 처리 로직 (GUI 비의존)"""
+
+    def __init__(self, auto_open=False):
+        self.auto_open = auto_open
+        self.cancel_event = None  # threading.Event - 설정되면 다음 확인 지점에서 처리 중단
+        self._subject_resolver = None
+        self._mapping_digest = None  # 현재 분류기를 만든 매핑 JSON의 내용 해시
+        self.profile = PipelineProfile()
+
+    def check_cancelled(self):
+        """취소 요청이 있으면 ProcessingCancelled 발생"""
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise ProcessingCancelled("처리가 취소되었습니다.")
+
+    def add_log(self, message, level=logging.INFO):
+        """로그 메시지 기록 - 출력 위치(콘솔/상태 창/파일)는 등록된 핸들러가 결정"""
+        logger.log(level, message)
+
+    def update_progress(self, value, message=""):
+        """진행률 갱신 - 코어에서는 메시지만 로그로 남김"""
+        if message:
+            self.add_log(message)
+
+    def normalize_subject_name(self, subject_name):
+        """과목명 정규화 함수 - 숫자와 특수문자 제거하여 매칭용 키 생성"""
+        if not subject_name:
+            return subject_name
+        return normalize_subject(subject_name)
+    
+    def get_subject_resolver(self, subject_group_mapping):
+        """매핑에 대한 교과(군) 분류기 반환 (같은 매핑 객체면 재사용)"""
+        resolver = self._subject_resolver
+        if resolver is None or resolver.mapping is not subject_group_mapping:
+            resolver = self._subject_resolver = SubjectGroupResolver(subject_group_mapping,
+                                                                     self.normalize_subject_name)
+            self._mapping_digest = None
+        return resolver
+
+    def get_subject_group(self, subject_name, subject_group_mapping):
+        """과목명으로 교과(군) 찾기 - 정규화된 이름으로 매칭 시도"""
+        return self.get_subject_resolver(subject_group_mapping).resolve(subject_name)
+
+    def open_file(self, path):
+        """Save 작업 후 파일을 여는 OS별 함수"""
+        if not self.auto_open:
+            return
+        import platform
+        import subprocess
+        system = platform.system()
+        try:
+            if system == 'Windows':
+                os.startfile(path)
+            elif system == 'Darwin':
+                subprocess.Popen(['open', path])
+            else:
+                subprocess.Popen(['xdg-open', path])
+        except Exception as e:
+            self.add_log(f"파일 자동 열기에 실패했습니다: {e}", logging.WARNING)
+    
+    def filter_subject_groups(self, subject_groups):
+        """교과 그룹 필터링 규칙 (같은 교과(군) 집합은 한 번만 계산)"""
+        return list(filter_group_set(frozenset(subject_groups)))
+
+    def filter_subject_group_sets(self, group_sets):
+        """여러 교과(군) 집합을 한 번에 필터링하여 {frozenset: 결과 목록} 반환
+
+        교사 수가 많아도 실제 교과(군) 조합은 수십 개뿐이므로 중복 없는 집합만 계산합니다.
+        """
+        return {groups: list(filter_group_set(groups)) for groups in set(map(frozenset, group_sets))}
+
+    def load_subject_group_mapping(self, json_path):
+        """JSON 파일에서 교과(군) 모집 데이터를 불러오는 함수
+
+        컴파일된 매핑 캐시를 사용하며, 내용이 이전 호출과 같으면 분류 결과 메모를
+        포함한 기존 분류기를 그대로 재사용합니다.
+        """
+        try:
+            digest, data, index = load_compiled_mapping(json_path)
+        except FileNotFoundError:
+            self.add_log(f"교과(군) 매핑 파일을 찾을 수 없습니다: {json_path}", logging.ERROR)
+            return {}
+
+        resolver = self._subject_resolver
+        if resolver is not None and self._mapping_digest == digest:
+            return resolver.mapping
+        self._subject_resolver = SubjectGroupResolver(data, self.normalize_subject_name, index)
+        self._mapping_digest = digest
+        logger.debug("[매핑 로드] 총 %d개 키를 로드했습니다. (예시: %s)", len(data), list(data)[:5])
+        return data
+
+    def iter_sheet_records(self, ws):
+        """워크시트에서 레코드를 하나씩 생성하는 함수 (values_only 행 스트리밍)
+
+        헤더('총시수')는 앞쪽 HEADER_PROBE_ROWS 행에서 한 번만 찾고, 이후에는 과목(B),
+        교사명(D), 총시수 열 범위만 읽습니다. 빈 행이 EMPTY_ROW_LIMIT 행 연속되면
+        서식 때문에 늘어난 나머지 행은 읽지 않습니다.
+        """
+        # 행 단위 상세 로그는 DEBUG 핸들러(상세 로그 파일)가 있을 때만 만듦
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+
+        # 읽기 전용 시트는 파일에 기록된 범위(dimension)가 실제와 다를 수 있어 초기화
+        if hasattr(ws, 'reset_dimensions'):
+            ws.reset_dimensions()
+
+        # 총시수 열 찾기
+        header_row = total_hours_col = None
+        rows_scanned = 0
+        for values in ws.iter_rows(max_row=HEADER_PROBE_ROWS, values_only=True):
+            rows_scanned += 1
+            if "총시수" in values:
+                header_row, total_hours_col = rows_scanned, values.index("총시수")
+                break
+        if header_row is None:
+            self.profile.count('rows_scanned', rows_scanned)
+            self.add_log(f"'{ws.title}' 시트에서 총시수 헤더를 찾지 못해 건너뜁니다.", logging.DEBUG)
+            return
+
+        # 과목(B열), 교사명(D열), 총시수 열을 포함하는 최소 범위만 읽음
+        first_col = min(2, total_hours_col + 1)
+        last_col = max(4, total_hours_col + 1)
+        subject_idx, teacher_idx, hours_idx = 2 - first_col, 4 - first_col, total_hours_col + 1 - first_col
+
+        empty_rows = 0
+        for values in ws.iter_rows(min_row=header_row + 1, min_col=first_col, max_col=last_col, values_only=True):
+            rows_scanned += 1
+            # 빈 행 건너뛰기 (연속되면 데이터가 끝난 것으로 보고 중단)
+            if not any(values):
+                empty_rows += 1
+                if empty_rows >= EMPTY_ROW_LIMIT:
+                    break
+                continue
+            empty_rows = 0
+
+            subject_full = values[subject_idx]
+            total_hours = values[hours_idx]
+            # 반복된 헤더 행, 출력일 등 과목이 아닌 행 제외
+            if not subject_full or not isinstance(subject_full, str) or total_hours == "총시수":
+                continue
+            if subject_full == "과목" or subject_full.startswith('20'):
+                continue
+            if not isinstance(total_hours, (int, float)):
+                continue
+
+            # 과목명에서 첫 번째 하이픈 전까지만 추출
+            subject = subject_full.strip().split('-')[0].strip()
+            teacher = values[teacher_idx].strip() if values[teacher_idx] else ""  # D열이 교사명
+
+            if debug_enabled:
+                anonymized_teacher = teacher[0] + '*' * (len(teacher) - 2) + teacher[-1] if len(teacher) > 1 else teacher
+                self.add_log(f"데이터 발견: {subject} (원본: {subject_full.strip()}) - {anonymized_teacher} - {total_hours}",
+                             logging.DEBUG)
+
+            yield {
+                '과목': subject,
+                '교사명': teacher,
+                '총시수': int(total_hours)
+            }
+
+        self.profile.count('rows_scanned', rows_scanned)
+
+    def extract_data(self, ws):
+        """워크시트에서 데이터를 추출하는 함수"""
+        return list(self.iter_sheet_records(ws))
+
+    def process_workbook(self, wb, on_sheet=None):
+        """워크북 전체 처리 - 시트별 레코드를 스트리밍하며 바로 중복 제거
+
+        (과목, 교사명, 총시수) 튜플 리스트를 반환합니다 (RecordStore.extend 입력 형태).
+        on_sheet(완료 시트 수, 전체 시트 수)는 시트 하나를 마칠 때마다 호출됩니다.
+        """
+        merged_results = {}  # (과목, 교사명) -> 총시수
+        records_extracted = 0
+        worksheets = wb.worksheets
+        for sheet_idx, ws in enumerate(worksheets, 1):
+            self.check_cancelled()
+            for item in self.iter_sheet_records(ws):
+                records_extracted += 1
+                key = (item['과목'], item['교사명'])
+                hours = item['총시수']
+                if key not in merged_results:
+                    merged_results[key] = hours
+                else:
+                    # 같은 과목-교사 조합이 있으면 시수 확인하여 큰 값 사용
+                    if hours > merged_results[key]:
+                        merged_results[key] = hours
+            if on_sheet is not None:
+                on_sheet(sheet_idx, len(worksheets))
+
+        self.profile.count('sheets', len(worksheets))
+        self.profile.count('records_extracted', records_extracted)
+        self.profile.count('records_kept', len(merged_results))
+        return [(subject, teacher, hours) for (subject, teacher), hours in merged_results.items()]
+
+    def extract_files(self, file_paths, workers=1, progress=None, cache=None):
+        """파일별 추출 결과를 (파일 경로, 결과) 형태로 입력 순서대로 반환
+
+        cache(ExtractionCache)가 주어지면 내용이 같은 파일은 캐시에서 바로 불러오고
+        나머지만 파싱한 뒤 캐시에 저장합니다. 파싱할 파일은 parse_files로 처리합니다.
+        """
+        file_paths = list(file_paths)
+        total = len(file_paths)
+        keys = [None] * total
+        cached = {}
+        if cache is not None:
+            for idx, file_path in enumerate(file_paths):
+                self.check_cancelled()
+                start = time.perf_counter()
+                keys[idx] = cache.key_for(file_path)
+                records = cache.get(keys[idx])
+                elapsed = time.perf_counter() - start
+                self.profile.add_time('cache_lookup', elapsed)
+                if records is not None:
+                    cached[idx] = records
+                    self.profile.files.append({'file': os.path.basename(file_path), 'seconds': round(elapsed, 4),
+                                               'records': len(records), 'cached': True})
+            self.profile.count('cache_hits', len(cached))
+            self.profile.count('cache_misses', total - len(cached))
+            if cached:
+                self.add_log(f"변경되지 않은 파일 {len(cached)}개는 캐시에서 불러옵니다.")
+
+        pending = [file_path for idx, file_path in enumerate(file_paths) if idx not in cached]
+        parse_progress = None
+        if progress is not None:
+            base = len(cached) / total if total else 0
+            progress(base)
+            parse_progress = lambda fraction: progress(base + fraction * len(pending) / total)
+
+        parsed = self.parse_files(pending, workers, parse_progress)
+        try:
+            for idx, file_path in enumerate(file_paths):
+                if idx in cached:
+                    yield file_path, cached[idx]
+                    continue
+                _, results = next(parsed)
+                if cache is not None:
+                    cache.put(keys[idx], results)
+                yield file_path, results
+        finally:
+            parsed.close()
+        if cache is not None and pending:
+            cache.evict()
+
+    def parse_files(self, file_paths, workers=1, progress=None):
+        """파일을 파싱하여 (파일 경로, 결과) 형태로 입력 순서대로 반환
+
+        workers가 2 이상이면 프로세스 풀에서 여러 파일을 동시에 파싱하고,
+        결과는 입력 순서를 그대로 유지합니다. progress(0~1)는 순차 처리에서는
+        시트 단위로, 병렬 처리에서는 파일 단위로 호출됩니다.
+        """
+        total = len(file_paths)
+        workers = min(workers, total)
+        if workers > 1:
+            self.add_log(f"{workers}개 프로세스로 파일을 병렬 처리합니다.")
+            debug_log_paths = [handler.baseFilename for handler in logger.handlers
+                               if isinstance(handler, logging.FileHandler) and handler.level <= logging.DEBUG]
+            from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+            executor = ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                           initargs=(debug_log_paths,))
+            try:
+                futures = [executor.submit(extract_file, file_path) for file_path in file_paths]
+                for done, (file_path, future) in enumerate(zip(file_paths, futures), 1):
+                    # 결과를 기다리는 동안에도 취소 요청을 주기적으로 확인
+                    while True:
+                        self.check_cancelled()
+                        try:
+                            records, worker_profile = future.result(timeout=CANCEL_POLL_INTERVAL)
+                            break
+                        except FutureTimeoutError:
+                            continue
+                    self.profile.merge(worker_profile)
+                    if progress is not None:
+                        progress(done / total)
+                    yield file_path, records
+            finally:
+                # 취소/오류 시 대기 중인 작업은 버리고 바로 반환
+                executor.shutdown(wait=False, cancel_futures=True)
+        else:
+            for file_idx, file_path in enumerate(file_paths):
+                self.check_cancelled()
+                self.add_log(f"파일 로드 중: {os.path.basename(file_path)}")
+                on_sheet = None
+                if progress is not None:
+                    on_sheet = lambda sheets_done, sheet_count, base=file_idx: progress(
+                        (base + sheets_done / sheet_count) / total)
+                yield file_path, self.parse_file(file_path, on_sheet)
+
+    def parse_file(self, file_path, on_sheet=None):
+        """파일 하나를 열어 process_workbook 결과 반환 (파일별 소요 시간 기록)"""
+        start = time.perf_counter()
+        with self.profile.stage('open_workbook'):
+            wb = open_workbook(file_path)
+        try:
+            with self.profile.stage('extract'):
+                results = self.process_workbook(wb, on_sheet)
+        finally:
+            wb.close()
+        self.profile.count('files')
+        self.profile.files.append({'file': os.path.basename(file_path),
+                                   'seconds': round(time.perf_counter() - start, 4),
+                                   'records': len(results), 'cached': False})
+        return results
+
+    def classify_subjects(self, store, subject_group_mapping):
+        """과목 코드별 교과(군) 목록 (과목마다 한 번씩만 분류)"""
+        resolver = self.get_subject_resolver(subject_group_mapping)
+        return [resolver.resolve(subject) for subject in store.subjects]
+
+    def log_unmatched_subjects(self, store, resolver, limit=UNMATCHED_SUMMARY_LIMIT):
+        """매핑되지 않아 '기타'로 분류된 과목을 과목별 레코드 수로 한 번에 요약 (과목마다 로그를 남기지 않음)"""
+        codes = {code for code, name in enumerate(store.subjects) if name in resolver.unmatched}
+        if not codes:
+            return
+        counts = Counter(code for code in store.subject if code in codes).most_common()
+        names = ', '.join(f"{store.subjects[code]}({count}건)" for code, count in counts[:limit])
+        if len(counts) > limit:
+            names += f" 외 {len(counts) - limit}개"
+        self.add_log(f"매핑되지 않아 '기타'로 분류된 과목 {len(counts)}개 "
+                     f"(레코드 {sum(count for _, count in counts)}건): {names}", logging.WARNING)
+        self.profile.count('unmatched_subjects', len(counts))
+
+    def aggregate_school_data(self, store, subject_groups):
+        """학교별·교사별 과목, 교과(군), 시수 집계를 한 번에 계산
+
+        store는 RecordStore, subject_groups는 classify_subjects 결과(과목 코드 -> 교과(군))입니다.
+        각 시트(교사별시수현황, 교사별총시수, 학교통계, 교과군조합현황)는
+        데이터를 다시 묶지 않고 이 결과를 공통으로 사용합니다.
+        """
+        school_hours = store.sum_by(store.school)
+        school_subjects = store.distinct_by(store.school, values=store.subject)
+        aggregates = [{
+            'school_name': school_name,
+            'teachers': {},  # 교사명 -> 교사별 집계 (처음 등장한 순서 유지)
+            'group_stats': {},  # 교과(군) -> 담당 교사, 과목 총시수
+            'total_hours': school_hours.get(code, 0),
+            'unique_subjects': len(school_subjects.get(code, ()))
+        } for code, school_name in enumerate(store.school_names)]
+
+        # 교사/교과(군) 집계는 열 배열을 한 번만 훑으며 계산 (문자열은 코드 표의 객체를 공유)
+        teacher_names, subject_names = store.teachers, store.subjects
+        columns = zip(store.school, store.teacher, store.subject, store.hours)
+        for row, (school_code, teacher_code, subject_code, hours) in enumerate(columns):
+            school = aggregates[school_code]
+            teacher = teacher_names[teacher_code]
+            subject = subject_names[subject_code]
+            group = subject_groups[subject_code]
+
+            stats = school['teachers'].get(teacher)
+            if stats is None:
+                stats = school['teachers'][teacher] = {
+                    'rows': array('i'),  # store 행 번호
+                    'groups': set(),
+                    'subjects': set(),
+                    'group_subjects': {},  # 교과(군) -> 해당 교과(군) 과목 집합
+                    'total_hours': 0
+                }
+            stats['rows'].append(row)
+            stats['groups'].add(group)
+            stats['subjects'].add(subject)
+            stats['group_subjects'].setdefault(group, set()).add(subject)
+            stats['total_hours'] += hours
+
+            group_stats = school['group_stats'].get(group)
+            if group_stats is None:
+                group_stats = school['group_stats'][group] = {'teachers': set(), 'total_hours': 0}
+            group_stats['teachers'].add(teacher)
+            group_stats['total_hours'] += hours
+        return aggregates
+
+    def register_named_styles(self, wb):
+        """결과 시트 공통 셀 스타일을 이름 있는 스타일로 등록 (셀마다 서식 객체를 만들지 않음)"""
+        from openpyxl.styles import Alignment, Border, Font, GradientFill, NamedStyle, Side
+        thin_side = Side(style='thin')
+        thin_border = Border(left=thin_side, right=thin_side, top=thin_side, bottom=thin_side)
+        center = Alignment(horizontal='center', vertical='center')
+
+        left = Alignment(horizontal='left', vertical='center')
+
+        # 대시보드 스타일 헤더용 그라데이션 배경
+        header_font = Font(bold=True)
+        header_fill = GradientFill(stop=('DCEFFB', 'E8DAEF'))
+        styles = [
+            NamedStyle(name=HEADER_STYLE, font=header_font, fill=header_fill, border=thin_border, alignment=center),
+            NamedStyle(name=HEADER_LEFT_STYLE, font=header_font, fill=header_fill, border=thin_border, alignment=left),
+            NamedStyle(name=CELL_STYLE, border=thin_border, alignment=center),
+            NamedStyle(name=CELL_LEFT_STYLE, border=thin_border, alignment=left)
+        ]
+        for style in styles:
+            wb.add_named_style(style)
+
+    def styled_row(self, ws, values, style=CELL_STYLE, styles=None):
+        """write-only 시트에 추가할 스타일 적용 셀 목록 생성 (styles로 열별 스타일 지정 가능)"""
+        from openpyxl.cell import WriteOnlyCell
+        row = []
+        for idx, value in enumerate(values):
+            cell = WriteOnlyCell(ws, value=value)
+            cell.style = styles[idx] if styles else style
+            row.append(cell)
+        return row
+
+    def set_column_widths(self, ws, widths, min_width=10, padding=2):
+        """열별 최대 표시 폭 목록으로 열 너비 지정"""
+        from openpyxl.utils import get_column_letter
+        for idx, width in enumerate(widths, 1):
+            ws.column_dimensions[get_column_letter(idx)].width = max(width + padding, min_width)
+
+    def write_rows(self, ws, headers, rows, styles=None, header_styles=None, widths=None):
+        """헤더와 데이터 행을 write-only 시트에 한 번에 기록
+
+        write-only 시트는 열 너비를 첫 행보다 먼저 지정해야 합니다. widths(열별 최대
+        표시 폭)를 주면 rows를 한 번만 순회하며 기록하므로 큰 시트의 행은 제너레이터로
+        넘길 수 있고, 주지 않으면 rows(리스트)의 값으로 폭을 계산합니다.
+        """
+        if widths is None:
+            widths = [0] * len(headers)
+            for values in rows:
+                fit_widths(widths, values)
+        widths = list(widths)
+        fit_widths(widths, headers)
+        self.set_column_widths(ws, widths)
+        ws.sheet_view.showGridLines = False
+
+        ws.append(self.styled_row(ws, headers, HEADER_STYLE, header_styles))
+        for values in rows:
+            ws.append(self.styled_row(ws, values, styles=styles))
+
+    def teacher_detail_widths(self, aggregates, store, subject_groups):
+        """교사별시수현황 열별 최대 표시 폭 (행 대신 중복 없는 값 목록에서 계산)"""
+        columns = [
+            {school['school_name'] for school in aggregates},
+            store.teachers,
+            store.subjects,
+            (min(store.hours), max(store.hours)) if store.hours else (),
+            set(subject_groups),
+        ]
+        return [max((display_width(str(value)) for value in values), default=0) for values in columns]
+
+    def teacher_detail_rows(self, aggregates, store, subject_groups):
+        """교사별시수현황 행: (학교명, 교사명, 과목, 총시수, 교과(군))"""
+        subject, hours, subjects = store.subject, store.hours, store.subjects
+        for school in aggregates:
+            school_name = school['school_name']
+            teachers = school['teachers']
+            for teacher in sorted(teachers):
+                for row in teachers[teacher]['rows']:
+                    code = subject[row]
+                    yield (school_name, teacher, subjects[code], hours[row], subject_groups[code])
+
+    def teacher_summary_rows(self, aggregates):
+        """교사별총시수 행: (학교명, 교사명, 담당교과, 총시수, 담당과목 수, 담당과목명, 교과(군)조합)"""
+        # 학교 코드가 학교명마다 하나이므로 (학교명, 교사명)은 이미 한 항목 (RecordStore 참고)
+        teachers = sorted(((school['school_name'], teacher, stats)
+                           for school in aggregates for teacher, stats in school['teachers'].items()),
+                          key=lambda item: item[:2])
+
+        # 규칙 적용하여 교과 필터링 (중복 없는 교과(군) 조합별로 한 번씩)
+        filtered = self.filter_subject_group_sets(stats['groups'] for _, _, stats in teachers)
+
+        # 학교별로 정렬하여 행 생성
+        rows = []
+        for school_name, teacher, stats in teachers:
+            subject_groups_str = ', '.join(filtered[frozenset(stats['groups'])])
+
+            # 과목명 목록 생성 (중복 제거)
+            subject_names = sorted(stats['subjects'])
+            subject_names_str = ', '.join(subject_names)
+
+            # 교과(군) 조합 문자열 생성
+            original_groups = sorted(stats['groups'])
+            combination_str = ' + '.join(original_groups) if len(original_groups) >= 2 else ""
+
+            rows.append((school_name, teacher, subject_groups_str, stats['total_hours'],
+                         len(subject_names), subject_names_str, combination_str))
+        return rows
+
+    def group_combination_rows(self, aggregates):
+        """교과군조합현황 행: (학교명, 교과(군) 조합, 교사수, 해당 교사명)"""
+        rows = []
+        for school in aggregates:
+            school_name = school['school_name']
+            
+            # 교과(군) 조합별 교사 수집
+            group_combinations = {}
+            for teacher, stats in school['teachers'].items():
+                groups = stats['groups']
+                if len(groups) >= 2:  # 2개 이상의 교과(군)을 담당하는 경우
+                    groups_tuple = tuple(sorted(groups))  # 정렬하여 동일한 조합을 같은 것으로 처리
+                    if groups_tuple not in group_combinations:
+                        group_combinations[groups_tuple] = []
+                    group_combinations[groups_tuple].append(teacher)
+            
+            # 조합별 데이터
+            for groups_tuple, teachers in sorted(group_combinations.items(), key=lambda x: (-len(x[0]), x[0])):
+                rows.append((school_name, ' + '.join(groups_tuple), len(teachers), ', '.join(sorted(teachers))))
+        return rows
+
+    def copy_to_write_only(self, source, target, styled_rows=0, fixed_widths=None, formula_fill=None):
+        """일반 워크시트의 값, 서식, 차트, 조건부 서식, 병합을 write-only 시트로 복사
+
+        원본을 한 번만 순회하며 styled_rows 행까지는 공통 셀 스타일(1행은 헤더 스타일)을
+        적용한 위에 원본 셀에 지정된 서식만 덧씌우고, 열 너비도 같은 순회에서 값의
+        표시 폭으로 계산합니다 (fixed_widths: {열 번호: 너비}로 고정 폭 지정).
+        formula_fill(색상)을 주면 수식 셀의 배경을 해당 색으로 칠합니다.
+        """
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import PatternFill
+        from openpyxl.utils import get_column_letter
+        if formula_fill is not None:
+            formula_fill = PatternFill(start_color=formula_fill, end_color=formula_fill, fill_type='solid')
+        widths = [0] * source.max_column
+        rows = []
+        for row_idx, source_row in enumerate(source.iter_rows(), 1):
+            base_style = HEADER_STYLE if row_idx == 1 else CELL_STYLE
+            row = []
+            for source_cell in source_row:
+                cell = WriteOnlyCell(target, value=source_cell.value)
+                if row_idx <= styled_rows:
+                    cell.style = base_style
+                if source_cell.has_style:
+                    # 기본값이 아닌 서식만 복사 (공통 스타일의 테두리/정렬 유지)
+                    style_ids = source_cell._style
+                    if style_ids.fontId:
+                        cell.font = copy(source_cell.font)
+                    if style_ids.fillId:
+                        cell.fill = copy(source_cell.fill)
+                    if style_ids.borderId:
+                        cell.border = copy(source_cell.border)
+                    if style_ids.alignmentId:
+                        cell.alignment = copy(source_cell.alignment)
+                    if style_ids.numFmtId:
+                        cell.number_format = source_cell.number_format
+                if formula_fill is not None and source_cell.data_type == 'f':
+                    cell.fill = formula_fill
+                row.append(cell)
+            fit_widths(widths, [cell.value for cell in row])
+            rows.append(row)
+
+        # write-only 시트는 열 너비와 행 높이를 첫 행보다 먼저 지정
+        self.set_column_widths(target, widths)
+        for col_idx, width in (fixed_widths or {}).items():
+            target.column_dimensions[get_column_letter(col_idx)].width = width
+        for idx, dim in source.row_dimensions.items():
+            if dim.height is not None:
+                target.row_dimensions[idx].height = dim.height
+        target.sheet_view.showGridLines = source.sheet_view.showGridLines
+        target.conditional_formatting = source.conditional_formatting
+        target.merged_cells = source.merged_cells
+        for chart in source._charts:
+            target.add_chart(chart)
+        for row in rows:
+            target.append(row)
+
+    def save_results(self, store, output_path, subject_group_mapping, single_school=False,
+                     stats_formulas=False, export_formats=()):
+        """RecordStore의 레코드를 집계하여 결과 파일 저장 (저장된 경로 반환)
+
+        export_formats('csv', 'sqlite', 'parquet')를 주면 같은 표를 결과 파일 옆에
+        해당 형식으로도 저장합니다 (neisExport 참고).
+        """
+        # 과목별 분류를 과목 코드마다 한 번씩 계산
+        resolver = self.get_subject_resolver(subject_group_mapping)
+        lookups, memo_hits = resolver.lookups, resolver.memo_hits
+        normalize_before = normalize_subject.cache_info()
+        with self.profile.stage('classify'):
+            subject_groups = self.classify_subjects(store, subject_group_mapping)
+        with self.profile.stage('aggregate'):
+            aggregates = self.aggregate_school_data(store, subject_groups)
+        self.profile.count('subject_lookups', resolver.lookups - lookups)
+        self.profile.count('subject_memo_hits', resolver.memo_hits - memo_hits)
+        normalize_after = normalize_subject.cache_info()
+        self.profile.count('normalize_hits', normalize_after.hits - normalize_before.hits)
+        self.profile.count('normalize_misses', normalize_after.misses - normalize_before.misses)
+        self.log_unmatched_subjects(store, resolver)
+        self.profile.count('schools', len(aggregates))
+        self.profile.count('teachers', sum(len(school['teachers']) for school in aggregates))
+
+        # 교사 단위 시트는 행을 바로 파일로 내보내는 write-only 워크북에 기록
+        import openpyxl
+        wb = openpyxl.Workbook(write_only=True)
+        self.register_named_styles(wb)
+        
+        with self.profile.stage('write_teacher_sheets'):
+            # 첫 번째 시트: 교사별 시수 현황
+            ws1 = wb.create_sheet(title="교사별시수현황")
+            detail_rows = partial(self.teacher_detail_rows, aggregates, store, subject_groups)
+            self.write_rows(ws1, DETAIL_HEADERS, detail_rows(),
+                            widths=self.teacher_detail_widths(aggregates, store, subject_groups))
+
+            # 두 번째 시트: 교사별 총계
+            ws2 = wb.create_sheet(title="교사별총시수")
+            summary_rows = self.teacher_summary_rows(aggregates)
+            # 전체 총계 (학교명+교사명 기준 교사 수)
+            total_rows = [
+                (None, "전체 교사수", None, len(summary_rows), None, None, None),
+                (None, "전체 시수", None, sum(row[3] for row in summary_rows), None, None, None)
+            ]
+            self.write_rows(ws2, SUMMARY_HEADERS, summary_rows + total_rows)
+        
+        # 세 번째 시트: 학교통계
+        with self.profile.stage('school_stats'):
+            ws3 = wb.create_sheet(title="학교통계")
+            stats_sheet, styled_rows = self.build_school_stats_sheet(aggregates, summary_rows, single_school,
+                                                                     stats_formulas)
+            self.copy_to_write_only(stats_sheet, ws3, styled_rows, fixed_widths=STATS_FIXED_WIDTHS,
+                                    formula_fill=FORMULA_FILL_COLOR)
+
+        # 네 번째 시트: 복수 교과(군) 조합 현황 (교사명 열은 왼쪽 정렬)
+        with self.profile.stage('write_combinations'):
+            ws4 = wb.create_sheet(title="교과군조합현황")
+            combination_rows = self.group_combination_rows(aggregates)
+            self.write_rows(ws4, COMBINATION_HEADERS, combination_rows,
+                            styles=[CELL_STYLE, CELL_STYLE, CELL_STYLE, CELL_LEFT_STYLE],
+                            header_styles=[HEADER_STYLE, HEADER_STYLE, HEADER_STYLE, HEADER_LEFT_STYLE])
+
+        # 엑셀 파일 저장 (파일이 열려 있으면 '(2)', '(3)' ... 이름으로 저장)
+        with self.profile.stage('save_workbook'):
+            try:
+                wb.save(output_path)
+            except PermissionError:
+                base, ext = os.path.splitext(output_path)
+                count = 2
+                while True:
+                    new_output_path = f"{base}({count}){ext}"
+                    try:
+                        wb.save(new_output_path)
+                        output_path = new_output_path
+                        break
+                    except PermissionError:
+                        count += 1
+
+        if export_formats:
+            with self.profile.stage('export'):
+                if stats_formulas:
+                    # 추가 형식에는 수식 대신 계산값을 기록
+                    stats_sheet = self.build_school_stats_sheet(aggregates, summary_rows, single_school)[0]
+                tables = [
+                    ('teacher_detail', DETAIL_HEADERS, detail_rows()),
+                    ('teacher_totals', SUMMARY_HEADERS, summary_rows),
+                    ('school_stats', *self.sheet_table(stats_sheet)),
+                    ('group_combinations', COMBINATION_HEADERS, combination_rows),
+                ]
+                from neisExport import export_tables
+                for path in export_tables(tables, output_path, export_formats):
+                    self.add_log(f"추가 형식 파일이 저장되었습니다: {path}")
+        self.open_file(output_path)
+        return output_path
+
+    def sheet_table(self, ws):
+        """시트의 첫 표(1행 헤더부터 첫 빈 행 전까지)를 (헤더, 행 목록)으로 반환"""
+        rows = []
+        for values in ws.iter_rows(values_only=True):
+            if all(value is None for value in values):
+                break
+            rows.append(values)
+        if not rows:
+            return [], []
+        headers = list(rows[0])
+        while headers and headers[-1] is None:
+            headers.pop()
+        return headers, [row[:len(headers)] for row in rows[1:]]
+
+    def school_group_totals(self, aggregates, summary_rows, subject_groups):
+        """학교통계의 교과(군)별 교사수, 교사의 총시수, 과목의 총시수를 미리 계산
+
+        기존 수식(COUNTIFS/SUMIFS)과 같은 기준을 따릅니다.
+        - 교사수/교사의 총시수: 교사별총시수의 담당교과에 교과(군) 이름이 포함된 교사
+        - 과목의 총시수: 교사별시수현황에서 교과(군)이 일치하는 과목의 시수
+        결과는 학교명별이며, 학교명은 aggregates에 한 번씩만 나옵니다.
+        """
+        totals = {school['school_name']: {group: {'teachers': 0, 'teacher_hours': 0, 'subject_hours': 0}
+                                          for group in subject_groups}
+                  for school in aggregates}
+        for school_name, _, subject_groups_str, total_hours, *_ in summary_rows:
+            school_totals = totals[school_name]
+            for group in subject_groups:
+                if group in subject_groups_str:
+                    school_totals[group]['teachers'] += 1
+                    school_totals[group]['teacher_hours'] += total_hours
+        for school in aggregates:
+            school_totals = totals[school['school_name']]
+            for group, stats in school['group_stats'].items():
+                school_totals[group]['subject_hours'] += stats['total_hours']
+        return totals
+
+    def build_school_stats_sheet(self, aggregates, summary_rows, single_school=False, stats_formulas=False):
+        """학교통계 시트 작성 (다과목지도, 교과(군)별 통계, 차트, KPI 포함)
+
+        교과(군)별 교사수/시수는 기본적으로 미리 계산한 값으로 기록하고,
+        stats_formulas가 True이면 데이터 행 범위로 제한한 검증용 수식으로 기록합니다.
+        (시트, 공통 셀 스타일을 적용할 행 수)를 반환하며, 공통 스타일과 수식 셀 배경,
+        열 너비는 copy_to_write_only에서 복사하면서 함께 지정합니다.
+        """
+        import openpyxl
+        from openpyxl.chart import BarChart, DoughnutChart, PieChart, Reference
+        from openpyxl.chart.label import DataLabelList
+        from openpyxl.formatting.rule import ColorScaleRule, DataBarRule
+        from openpyxl.styles import Alignment, Font, GradientFill, PatternFill
+        from openpyxl.utils import get_column_letter
+        # 학교통계 시트는 학교 수 × 교과(군) 크기로 작으므로 일반 워크시트에서 작성
+        # (행 삭제, 셀 재참조, 병합 등을 그대로 사용)
+        ws3 = openpyxl.Workbook().active
+        ws3.title = "학교통계"
+        
+        # 헤더 생성
+        headers = ['학교명']
+        header_row = 1
+        
+        # 헤더 동적 생성을 위한 최대값 계산
+        max_subjects = 1
+        max_groups = 1
+        aggregated_teacher_subject_counts = {}
+        total_teachers_all = 0
+        all_subject_groups = set()
+        for school in aggregates:
+            teachers = school['teachers']
+            if teachers:  # 값이 있는 경우에만 max 계산
+                max_subjects = max(max_subjects, max(len(stats['rows']) for stats in teachers.values()))
+                max_groups = max(max_groups, max(len(stats['groups']) for stats in teachers.values()))
+            all_subject_groups.update(school['group_stats'])
+
+        total_all_hours = sum(row[3] for row in summary_rows)
+        # 수식 참조 범위 (교사별총시수 / 교사별시수현황 시트의 마지막 데이터 행)
+        summary_end = len(summary_rows) + 1
+        detail_end = sum(len(stats['rows']) for school in aggregates for stats in school['teachers'].values()) + 1
+        if not stats_formulas:
+            group_totals = self.school_group_totals(aggregates, summary_rows, all_subject_groups)
+        
+        # 1. 다과목지도 현황 헤더
+        for i in range(1, max_subjects + 1):
+            headers.extend([
+                f'{i}과목_교사수',
+                f'{i}과목_비율'
+            ])
+        
+        # 2. 교과(군)별 통계 헤더
+        subject_group_column_map = {}
+        # 전문적인 파스텔 톤 색상 팔레트 적용
+        color_palette = [
+            'AED6F1', 'A9DFBF', 'F9E79F', 'F5CBA7',
+            'D2B4DE', 'A9CCE3', 'FADBD8', 'D7BDE2'
+        ]
+        for idx, group in enumerate(sorted(all_subject_groups)):
+            start_idx = len(headers) + 1
+            headers.extend([
+                f'{group}_교과(군)_교사수',
+                f'{group}_교과(군)_교사의_총시수',
+                f'{group}_교과(군)_과목의_총시수',
+                f'{group}_교과(군)_교사의_평균시수',
+                f'{group}_교과(군)_교사의_평균과목수'
+            ])
+            subject_group_column_map[group] = list(range(start_idx, start_idx + 5))
+        subject_group_colors = {g: color_palette[i % len(color_palette)] for i, g in enumerate(sorted(all_subject_groups))}
+
+        # 3. 복수 교과(군) 통계 헤더
+        for i in range(1, max_groups + 1):
+            headers.extend([
+                f'{i}개교과군_교사수',
+                f'{i}개교과군_비율'
+            ])
+        
+        # 4. 총계 관련 헤더 수정
+        headers.extend([
+            '전체_교사수',
+            '전체_시수',
+            '평균시수',  # 추가
+            '전체_과목수',
+            '개설_과목수',  # 추가
+            '평균_과목수'
+        ])
+        
+        # 헤더 쓰기 (이모지 아이콘 포함)
+        emoji_map = {
+            '학교명': '🏫',
+            '전체_교사수': '👩\u200d🏫',
+            '전체_시수': '⏱️',
+            '평균시수': '📊',
+            '전체_과목수': '📚',
+            '개설_과목수': '🆕',
+            '평균_과목수': '💡'
+        }
+        for col, header in enumerate(headers, 1):
+            icon = emoji_map.get(header, '')
+            display = f"{header} {icon}" if icon else header
+            ws3.cell(row=1, column=col, value=display)
+        
+        # 데이터 입력 (각 학교별로)
+        current_row = 2
+        for school in aggregates:
+            col = 1
+            school_name = school['school_name']
+            teachers = school['teachers']
+            
+            total_teachers = len(teachers)
+            total_teachers_all += total_teachers
+            
+            # 학교명 입력
+            ws3.cell(row=current_row, column=col, value=school_name)
+            col += 1
+            
+            # 1. 다과목지도 현황 데이터
+            teacher_subject_counts = {}
+            for stats in teachers.values():
+                subject_count = len(stats['rows'])
+                teacher_subject_counts[subject_count] = teacher_subject_counts.get(subject_count, 0) + 1
+                aggregated_teacher_subject_counts[subject_count] = aggregated_teacher_subject_counts.get(subject_count, 0) + 1
+            
+            for i in range(1, max_subjects + 1):
+                count = teacher_subject_counts.get(i, 0)
+                percentage = round((count / total_teachers) * 100, 1) if total_teachers > 0 else 0
+                ws3.cell(row=current_row, column=col, value=count)
+                ws3.cell(row=current_row, column=col+1, value=percentage)
+                col += 2
+            
+            # 2. 교과(군)별 통계 데이터
+            subject_group_stats = school['group_stats']
+            for group in sorted(all_subject_groups):
+                stats = subject_group_stats.get(group, {'teachers': set(), 'total_hours': 0})
+                teacher_count = len(stats['teachers'])
+                
+                # 교과(군)별 평균과목수 - 각 교사가 담당하는 해당 교과(군) 과목 수의 평균
+                group_subjects = [len(teachers[teacher]['group_subjects'][group]) for teacher in stats['teachers']]
+                avg_subjects = round(sum(group_subjects) / teacher_count, 2) if teacher_count > 0 else 0
+                
+                count_cell = ws3.cell(row=current_row, column=col)
+                teacher_total_cell = ws3.cell(row=current_row, column=col + 1)
+                subject_total_cell = ws3.cell(row=current_row, column=col + 2)
+                avg_cell = ws3.cell(row=current_row, column=col + 3)
+                if stats_formulas:
+                    # 검증용 수식 - 참조 범위를 실제 데이터 행으로 제한
+                    summary_c = f"'교사별총시수'!$C$2:$C${summary_end}"
+                    summary_d = f"'교사별총시수'!$D$2:$D${summary_end}"
+                    detail_d = f"'교사별시수현황'!$D$2:$D${detail_end}"
+                    detail_e = f"'교사별시수현황'!$E$2:$E${detail_end}"
+                    if single_school:
+                        count_cell.value = f"=COUNTIF({summary_c},\"*{group}*\")"
+                        teacher_total_cell.value = f"=SUMIFS({summary_d},{summary_c},\"*{group}*\")"
+                        subject_total_cell.value = f"=SUMIFS({detail_d},{detail_e},\"{group}\")"
+                        avg_cell.value = f"=IFERROR(AVERAGEIF({summary_c},\"*{group}*\",{summary_d}),0)"
+                    else:
+                        school_ref = f"$A{current_row}"
+                        summary_a = f"'교사별총시수'!$A$2:$A${summary_end}"
+                        detail_a = f"'교사별시수현황'!$A$2:$A${detail_end}"
+                        count_cell.value = f"=COUNTIFS({summary_a},{school_ref},{summary_c},\"*{group}*\")"
+                        teacher_total_cell.value = (
+                            f"=SUMIFS({summary_d},{summary_a},{school_ref},{summary_c},\"*{group}*\")"
+                        )
+                        subject_total_cell.value = (
+                            f"=SUMIFS({detail_d},{detail_a},{school_ref},{detail_e},\"{group}\")"
+                        )
+                        avg_cell.value = (
+                            f"=IFERROR(AVERAGEIFS({summary_d},{summary_a},{school_ref},{summary_c},\"*{group}*\"),0)"
+                        )
+                else:
+                    # 미리 계산한 값 (수식과 같은 기준)
+                    totals = group_totals[school_name][group]
+                    count_cell.value = totals['teachers']
+                    teacher_total_cell.value = totals['teacher_hours']
+                    subject_total_cell.value = totals['subject_hours']
+                    avg_cell.value = totals['teacher_hours'] / totals['teachers'] if totals['teachers'] else 0
+                ws3.cell(row=current_row, column=col + 4, value=avg_subjects)  # 평균과목수 입력
+                col += 5  # 컬럼 개수 5로 수정
+            
+            # 3. 복수 교과(군) 통계 데이터
+            multi_group_stats = {}
+            for stats in teachers.values():
+                group_count = len(stats['groups'])
+                multi_group_stats[group_count] = multi_group_stats.get(group_count, 0) + 1
+            
+            for i in range(1, max_groups + 1):
+                count = multi_group_stats.get(i, 0)
+                percentage = round((count / total_teachers) * 100, 1) if total_teachers > 0 else 0
+                ws3.cell(row=current_row, column=col, value=count)
+                ws3.cell(row=current_row, column=col+1, value=percentage)
+                col += 2
+            
+            # 4. 총계 데이터
+            total_hours = school['total_hours']
+            avg_hours = round(total_hours / total_teachers, 2) if total_teachers > 0 else 0  # 평균시수 계산
+            
+            total_subjects = sum(count * subjects for subjects, count in teacher_subject_counts.items())
+            unique_subjects = school['unique_subjects']  # 중복 제거한 과목 수
+            avg_subjects = round(total_subjects / total_teachers, 2) if total_teachers > 0 else 0
+            
+            ws3.cell(row=current_row, column=col, value=total_teachers)
+            col += 1
+            ws3.cell(row=current_row, column=col, value=total_hours)
+            col += 1
+            ws3.cell(row=current_row, column=col, value=avg_hours)  # 평균시수 입력
+            col += 1
+            ws3.cell(row=current_row, column=col, value=total_subjects)
+            col += 1
+            ws3.cell(row=current_row, column=col, value=unique_subjects)  # 개설과목수 입력
+            col += 1
+            ws3.cell(row=current_row, column=col, value=avg_subjects)
+            current_row += 1
+
+        data_end_row = current_row - 1
+
+        if not single_school:
+            teacher_col = headers.index('전체_교사수') + 1
+            avg_col = headers.index('평균시수') + 1
+            cats = Reference(ws3, min_col=1, min_row=2, max_row=data_end_row)
+            data_ref = Reference(ws3, min_col=teacher_col, max_col=avg_col, min_row=1, max_row=data_end_row)
+            bar_chart = BarChart()
+            bar_chart.title = "교사수 및 평균시수"
+            bar_chart.add_data(data_ref, titles_from_data=True)
+            bar_chart.set_categories(cats)
+            ws3.add_chart(bar_chart, f"A{data_end_row + 3}")
+
+            summary_start = data_end_row + 2
+            ws3.cell(row=summary_start, column=1, value="과목수")
+            ws3.cell(row=summary_start, column=2, value="비율")
+            for i in range(1, max_subjects + 1):
+                percent = round((aggregated_teacher_subject_counts.get(i, 0) / total_teachers_all) * 100, 2) if total_teachers_all > 0 else 0
+                ws3.cell(row=summary_start + i, column=1, value=f"{i}과목")
+                ws3.cell(row=summary_start + i, column=2, value=percent)
+            pie = PieChart()
+            labels = Reference(ws3, min_col=1, min_row=summary_start + 1, max_row=summary_start + max_subjects)
+            data = Reference(ws3, min_col=2, min_row=summary_start, max_row=summary_start + max_subjects)
+            pie.add_data(data, titles_from_data=True)
+            pie.set_categories(labels)
+            pie.title = "과목수별 비율"
+            ws3.add_chart(pie, f"A{summary_start + max_subjects + 2}")
+
+        # 단일 학교 모드인 경우 세로 형태로 변환
+        if single_school and len(aggregates) == 1:
+            headers_row = [ws3.cell(row=1, column=i).value for i in range(1, ws3.max_column + 1)]
+            values_row = [ws3.cell(row=2, column=i).value for i in range(1, ws3.max_column + 1)]
+            ws3.delete_rows(1, ws3.max_row)
+            ws3.cell(row=1, column=1, value="항목")
+            ws3.cell(row=1, column=2, value="값")
+
+            for idx, (h, v) in enumerate(zip(headers_row, values_row), start=2):
+                ws3.cell(row=idx, column=1, value=h)
+                ws3.cell(row=idx, column=2, value=v)
+
+            # ----- Charts for single school -----
+            # 교과(군)별 평균시수 막대그래프 데이터 수집
+            avg_rows = []
+            for r in range(2, ws3.max_row + 1):
+                label = str(ws3.cell(row=r, column=1).value)
+                if label.endswith('_교과(군)_교사의_평균시수'):
+                    subject = label.split('_')[0]
+                    avg_rows.append((subject, r))
+
+            chart_start = ws3.max_row + 2
+            for idx, (subject, row) in enumerate(avg_rows, start=0):
+                ws3.cell(row=chart_start + idx, column=1, value=subject)
+                ws3.cell(row=chart_start + idx, column=2, value=ws3.cell(row=row, column=2).value)
+
+            if avg_rows:
+                cats = Reference(ws3, min_col=1, min_row=chart_start, max_row=chart_start + len(avg_rows) - 1)
+                data = Reference(ws3, min_col=2, min_row=chart_start, max_row=chart_start + len(avg_rows) - 1)
+                bar = BarChart()
+                bar.title = "교과(군)별 평균시수"
+                bar.add_data(data, titles_from_data=False)
+                bar.set_categories(cats)
+                bar.legend = None
+                bar.dataLabels = DataLabelList()
+                bar.dataLabels.showVal = True
+                bar.width = 12
+                bar.height = 8
+                ws3.add_chart(bar, "D2")
+
+            # n과목 교사 비율 도넛차트 데이터 수집
+            ratio_rows = []
+            for r in range(2, chart_start):
+                label = str(ws3.cell(row=r, column=1).value)
+                if label.endswith('과목_비율') and not label.endswith('개교과군_비율'):
+                    ratio_rows.append((label.split('_')[0], r))
+
+            donut_start = chart_start + len(avg_rows) + 1
+            for idx, (label, row) in enumerate(ratio_rows, start=0):
+                ws3.cell(row=donut_start + idx, column=1, value=label)
+                ws3.cell(row=donut_start + idx, column=2, value=ws3.cell(row=row, column=2).value)
+
+            if ratio_rows:
+                cats = Reference(ws3, min_col=1, min_row=donut_start, max_row=donut_start + len(ratio_rows) - 1)
+                data = Reference(ws3, min_col=2, min_row=donut_start, max_row=donut_start + len(ratio_rows) - 1)
+                donut = DoughnutChart()
+                donut.style = 3  # 차트 디자인 3 적용
+                donut.title = "과목수별 비율"
+                donut.add_data(data, titles_from_data=False)
+                donut.set_categories(cats)
+                donut.dataLabels = DataLabelList()
+                donut.dataLabels.showPercent = True
+                donut.width = 12
+                donut.height = 8
+                ws3.add_chart(donut, "L2")
+
+        # 여기까지의 행에는 복사할 때 공통 셀 스타일(1행은 헤더 스타일)을 적용
+        styled_rows = ws3.max_row
+
+        # 교과별 색상 적용 및 평균시수 서식 지정
+        if single_school and len(aggregates) == 1:
+            # 세로 레이아웃에 맞게 색상 및 서식 적용
+            for row in range(2, ws3.max_row + 1):
+                label = str(ws3.cell(row=row, column=1).value)
+                value_cell = ws3.cell(row=row, column=2)
+                for group, color in subject_group_colors.items():
+                    if label.startswith(group):
+                        fill = PatternFill(start_color=color, end_color=color, fill_type='solid')
+                        ws3.cell(row=row, column=1).fill = fill
+                        value_cell.fill = fill
+                if '평균시수' in label:
+                    value_cell.number_format = '0.00'
+        else:
+            for group, cols in subject_group_column_map.items():
+                fill = PatternFill(start_color=subject_group_colors[group], end_color=subject_group_colors[group], fill_type='solid')
+                avg_col = cols[3]
+                for row in range(1, data_end_row + 1):
+                    for col_idx in cols:
+                        ws3.cell(row=row, column=col_idx).fill = fill
+                    if row >= 2:
+                        ws3.cell(row=row, column=avg_col).number_format = '0.00'
+
+            avg_hours_col = headers.index('평균시수') + 1
+            for row in range(2, data_end_row + 1):
+                ws3.cell(row=row, column=avg_hours_col).number_format = '0.00'
+
+            # 조건부 서식: 데이터 바 및 컬러 스케일 적용
+            teacher_col_letter = get_column_letter(teacher_col)
+            avg_hours_col_letter = get_column_letter(avg_hours_col)
+            ws3.conditional_formatting.add(
+                f"{teacher_col_letter}2:{teacher_col_letter}{data_end_row}",
+                DataBarRule(start_type='num', start_value=0, end_type='max', color='5DADE2')
+            )
+            ws3.conditional_formatting.add(
+                f"{avg_hours_col_letter}2:{avg_hours_col_letter}{data_end_row}",
+                ColorScaleRule(start_type='min', start_color='FFFFFF', mid_type='percentile', mid_value=50,
+                               mid_color='FFF5CC', end_type='max', end_color='A9DFBF')
+            )
+
+            # KPI 카드 작성
+            kpi_start = ws3.max_row + 2
+            kpis = [
+                ('학교수', len(aggregates), '🏫'),
+                ('총 교사수', total_teachers_all, '👩\u200d🏫'),
+                ('총 시수', total_all_hours, '⏱️'),
+                (
+                    '평균 시수',
+                    round(total_all_hours / total_teachers_all, 2) if total_teachers_all else 0,
+                    '📊'
+                )
+            ]
+            card_width = 4
+            for idx, (label, value, icon) in enumerate(kpis):
+                start_col = 1 + idx * card_width
+                end_col = start_col + card_width - 1
+                ws3.merge_cells(start_row=kpi_start, start_column=start_col,
+                                end_row=kpi_start, end_column=end_col)
+                cell = ws3.cell(row=kpi_start, column=start_col, value=f"{icon} {label}: {value}")
+                cell.alignment = Alignment(horizontal='center', vertical='center')
+                cell.font = Font(bold=True)
+                cell.fill = GradientFill(stop=('FFFFFF', 'D6EAF8'))
+            ws3.row_dimensions[kpi_start].height = 25
+
+        ws3.sheet_view.showGridLines = False
+        return ws3, styled_rows
+
+    def run_pipeline(self, file_paths, single_mode=True, mapping_path=DEFAULT_MAPPING_FILE, output_path=None,
+                     workers=1, stats_formulas=False, cache=None, cprofile_path=None, export_formats=()):
+        """추출 → 병합 → 분류 → 저장 전체 처리
+
+        workers는 파일 파싱에 사용할 프로세스 수입니다 (1이면 현재 프로세스에서 순차 처리).
+        stats_formulas가 True이면 학교통계에 값 대신 검증용 수식을 기록합니다.
+        cache(ExtractionCache)가 주어지면 내용이 바뀌지 않은 파일은 다시 파싱하지 않습니다.
+        단계별 소요 시간 요약은 결과 파일 옆 '<결과 파일명>.timing.json'에 저장하고,
+        cprofile_path가 주어지면 cProfile 결과도 저장합니다 (작업 프로세스 제외).
+        export_formats는 save_results의 추가 출력 형식입니다.
+        저장된 결과 파일 경로를 반환하며, 처리할 데이터가 없으면 None을 반환합니다.
+        cancel_event가 설정되면 ProcessingCancelled가 발생합니다.
+        """
+        if cprofile_path:
+            import cProfile
+            profiler = cProfile.Profile()
+            try:
+                return profiler.runcall(self.run_pipeline, file_paths, single_mode, mapping_path, output_path,
+                                        workers, stats_formulas, cache, None, export_formats)
+            finally:
+                profiler.dump_stats(cprofile_path)
+                self.add_log(f"cProfile 결과를 저장했습니다: {cprofile_path}")
+
+        if output_path is None:
+            output_path = os.path.join(os.getcwd(), DEFAULT_OUTPUT_FILE)
+
+        self.add_log("파일 처리 시작...")
+        self.profile = PipelineProfile()
+        store = RecordStore()  # 전체 레코드 (파일을 추가할 때마다 학교/교사/과목 중복을 합침)
+        if single_mode:
+            single_school_code = store.add_school('단일학교')
+
+        # 교과(군) 모집 데이터 불러오기
+        with self.profile.stage('load_mapping'):
+            subject_group_mapping = self.load_subject_group_mapping(mapping_path)
+        self.add_log("교과(군) 매핑 데이터를 불러왔습니다.")
+
+        # 선택된 모든 파일 처리 (입력 순서 유지)
+        # 파일 추출까지를 전체 진행률의 90%로 표시하고 나머지는 저장 단계
+        file_paths = list(file_paths)
+        for file_path, results in self.extract_files(file_paths, workers,
+                                                     lambda fraction: self.update_progress(fraction * 90),
+                                                     cache):
+            filename = os.path.basename(file_path)
+            school_name = parse_school_name(file_path, single_mode)
+            merged = store.extend(single_school_code if single_mode else store.add_school(school_name), results)
+            self.add_log(f"파일 처리 완료: {filename} (학교명: {school_name}, {len(results)}건"
+                         + (f", 앞선 파일과 중복 {merged}건 합침)" if merged else ")"))
+
+        self.profile.count('records_merged', store.merged)
+
+        if (single_mode and not len(store)) or not store.school_names:
+            self.add_log("처리할 데이터가 없습니다.", logging.WARNING)
+            return None
+
+        self.check_cancelled()
+        self.update_progress(90, "결과 파일 작성 중...")
+        saved_path = self.save_results(store, output_path, subject_group_mapping,
+                                       single_school=single_mode, stats_formulas=stats_formulas,
+                                       export_formats=export_formats)
+        self.update_progress(100, f"결과 파일이 저장되었습니다: {saved_path}")
+        self.write_timing_summary(saved_path)
+        return saved_path
+
+    def write_timing_summary(self, saved_path):
+        """단계별 소요 시간 요약을 상태 로그에 남기고 결과 파일 옆에 JSON으로 저장"""
+        for line in self.profile.log_lines():
+            self.add_log(line)
+        timing_path = os.path.splitext(saved_path)[0] + TIMING_SUFFIX
+        try:
+            with open(timing_path, 'w', encoding='utf-8') as f:
+                json.dump(self.profile.summary(), f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            self.add_log(f"소요 시간 요약을 저장하지 못했습니다: {e}", logging.WARNING)
@@ -0,0 +1,100 @@
+"""집계 결과 추가 출력 (CSV / SQLite / Parquet)
+
+결과집계표.xlsx와 같은 표(교사별 상세, 교사별 총시수, 학교통계, 교과군조합)를
+분석 도구에서 바로 읽을 수 있는 형식으로 저장합니다. 파일은 결과 xlsx와 같은
+위치에 같은 이름으로 만들어집니다.
+    CSV     결과집계표_<표 이름>.csv (표마다 한 파일, Excel 호환 UTF-8 BOM)
+    SQLite  결과집계표.sqlite (표마다 한 테이블)
+    Parquet 결과집계표_<표 이름>.parquet (pyarrow가 설치된 경우에만)
+"""
+import logging
+import os
+
+logger = logging.getLogger("neis")
+
+EXPORT_FORMATS = ("csv", "sqlite", "parquet")
+
+
+def unique_headers(headers):
+    """빈 헤더는 열 번호로 채우고 중복 헤더에는 번호를 붙임 (SQLite/Parquet 열 이름용)"""
+    seen = {}
+    result = []
+    for idx, header in enumerate(headers, 1):
+        name = str(header) if header not in (None, "") else f"열{idx}"
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}_{seen[name]}"
+        else:
+            seen[name] = 1
+        result.append(name)
+    return result
+
+
+def write_csv(tables, base_path):
+    import csv
+    paths = []
+    for name, headers, rows in tables:
+        path = f"{base_path}_{name}.csv"
+        with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(headers)
+            writer.writerows(rows)
+        paths.append(path)
+    return paths
+
+
+def write_sqlite(tables, base_path):
+    import sqlite3
+    path = f"{base_path}.sqlite"
+    conn = sqlite3.connect(path)
+    try:
+        with conn:
+            for name, headers, rows in tables:
+                columns = ", ".join('"{}"'.format(header.replace('"', '""')) for header in unique_headers(headers))
+                conn.execute(f'DROP TABLE IF EXISTS "{name}"')
+                conn.execute(f'CREATE TABLE "{name}" ({columns})')
+                conn.executemany(f'INSERT INTO "{name}" VALUES ({", ".join("?" * len(headers))})', rows)
+    finally:
+        conn.close()
+    return [path]
+
+
+def write_parquet(tables, base_path):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        logger.warning("Parquet 출력에는 pyarrow가 필요합니다 (pip install pyarrow). Parquet 출력을 건너뜁니다.")
+        return []
+
+    paths = []
+    for name, headers, rows in tables:
+        columns = {}
+        for idx, header in enumerate(unique_headers(headers)):
+            values = [row[idx] for row in rows]
+            # 숫자와 문자열이 섞인 열(단일 학교 학교통계의 '값' 등)은 문자열로 통일
+            kinds = {type(value) for value in values if value is not None}
+            if len(kinds) > 1 and not kinds <= {int, float}:
+                values = [None if value is None else str(value) for value in values]
+            columns[header] = values
+        path = f"{base_path}_{name}.parquet"
+        pq.write_table(pa.table(columns), path)
+        paths.append(path)
+    return paths
+
+
+WRITERS = {
+    "csv": write_csv,
+    "sqlite": write_sqlite,
+    "parquet": write_parquet,
+}
+
+
+def export_tables(tables, output_path, formats):
+    """(표 이름, 헤더, 행 목록) 목록을 요청한 형식으로 저장하고 만든 파일 경로 목록 반환"""
+    base_path = os.path.splitext(output_path)[0]
+    tables = [(name, list(headers), [tuple(row) for row in rows]) for name, headers, rows in tables]
+    paths = []
+    for fmt in formats:
+        paths.extend(WRITERS[fmt](tables, base_path))
+    return paths
@@ -0,0 +1,193 @@
+"""교과(군) 매핑 일괄 갱신 (헤드리스)
+
+'과목명<TAB>교과(군)' 형태의 TSV/텍스트, CSV, xlsx 파일을 한 줄씩 읽어 기존
+subject_group_mapping.json에 병합합니다. 기존 값과 다른 교과(군)이 들어오면
+충돌로 보고하고(기본값은 기존 값 유지, --overwrite로 새 값 적용), 결과 JSON은
+임시 파일에 쓴 뒤 교체하므로 도중에 중단되어도 기존 파일이 깨지지 않습니다.
+
+사용 예:
+    python -m neisMapping 2022개정_과목.xlsx 추가과목.tsv --report 충돌.csv
+"""
+import argparse
+import json
+import os
+import re
+import sys
+
+from neisCore import DEFAULT_MAPPING_FILE
+
+# 탭 또는 두 칸 이상의 공백으로 열 구분 (엑셀에서 복사한 텍스트)
+COLUMN_SPLIT_PATTERN = re.compile(r'\t+|\s{2,}')
+HEADER_KEYS = ('key', 'keys', '과목명')
+# 기존 매핑 파일의 들여쓰기 (첫 번째로 들여쓴 줄의 앞 공백)
+INDENT_PATTERN = re.compile(r'\n([ \t]+)\S')
+DEFAULT_INDENT = 4
+
+
+def split_columns(line):
+    """텍스트 한 줄을 값이 있는 열 목록으로 분리"""
+    return [part.strip() for part in COLUMN_SPLIT_PATTERN.split(line.strip()) if part.strip()]
+
+
+def pairs_from_rows(rows, header_keys=HEADER_KEYS):
+    """열 목록 이터러블에서 (과목명, 교과(군)) 쌍을 하나씩 생성 (헤더와 값이 부족한 행은 건너뜀)"""
+    for parts in rows:
+        if len(parts) < 2 or not parts[0] or not parts[1]:
+            continue
+        key, value = str(parts[0]).strip(), str(parts[1]).strip()
+        if key.lower() in header_keys:
+            continue
+        yield key, value
+
+
+def iter_text_rows(lines):
+    """텍스트 줄 이터러블을 열 목록으로 변환"""
+    for line in lines:
+        yield split_columns(line)
+
+
+def iter_source_rows(path):
+    """파일 형식(확장자)에 맞춰 행을 한 줄씩 읽어 열 목록으로 생성"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.xlsx':
+        import openpyxl
+        wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+        try:
+            for ws in wb.worksheets:
+                for values in ws.iter_rows(max_col=2, values_only=True):
+                    yield [value for value in values if value is not None and str(value).strip()]
+        finally:
+            wb.close()
+    elif ext == '.csv':
+        import csv
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            yield from csv.reader(f)
+    else:
+        with open(path, 'r', encoding='utf-8-sig') as f:
+            yield from iter_text_rows(f)
+
+
+class MergeReport:
+    """병합 결과 집계 (추가/변경 없음/충돌)"""
+
+    def __init__(self):
+        self.added = 0
+        self.unchanged = 0
+        self.conflicts = []  # (과목명, 기존 교과(군), 새 교과(군), 출처)
+
+    def summary(self):
+        return f"추가 {self.added}개, 변경 없음 {self.unchanged}개, 충돌 {len(self.conflicts)}개"
+
+
+def merge_pairs(mapping, pairs, source="", overwrite=False, report=None):
+    """(과목명, 교과(군)) 쌍을 mapping에 병합하고 MergeReport 반환
+
+    이미 있는 과목의 교과(군)이 다르면 충돌로 기록하며, overwrite가 True이면 새 값으로 바꿉니다.
+    """
+    report = report or MergeReport()
+    for key, value in pairs:
+        current = mapping.get(key)
+        if current is None:
+            mapping[key] = value
+            report.added += 1
+        elif current == value:
+            report.unchanged += 1
+        else:
+            report.conflicts.append((key, current, value, source))
+            if overwrite:
+                mapping[key] = value
+    return report
+
+
+def load_mapping(path):
+    """기존 매핑과 줄바꿈 형식, 들여쓰기 반환 (파일이 없으면 빈 매핑)
+
+    들여쓴 줄이 없는 한 줄짜리 JSON이면 들여쓰기는 None입니다.
+    """
+    if not os.path.exists(path):
+        return {}, '\n', DEFAULT_INDENT
+    with open(path, 'rb') as f:
+        text = f.read().decode('utf-8-sig')
+    newline = '\r\n' if '\r\n' in text else '\n'
+    match = INDENT_PATTERN.search(text)
+    if match:
+        indent = match.group(1)
+        indent = len(indent) if indent.strip(' ') == '' else indent
+    else:
+        indent = DEFAULT_INDENT if '\n' in text.strip() else None
+    return json.loads(text), newline, indent
+
+
+def write_mapping(path, mapping, newline='\n', indent=DEFAULT_INDENT):
+    """매핑 JSON을 임시 파일에 쓴 뒤 교체 (원자적 저장)"""
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'w', encoding='utf-8', newline=newline) as f:
+            json.dump(mapping, f, indent=indent, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def write_conflict_report(path, conflicts):
+    """충돌 목록을 CSV(Excel 호환 UTF-8 BOM)로 저장"""
+    import csv
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["과목명", "기존 교과(군)", "새 교과(군)", "출처"])
+        writer.writerows(conflicts)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m neisMapping",
+        description="TSV/CSV/xlsx의 '과목명, 교과(군)' 목록을 교과(군) 매핑 JSON에 병합합니다."
+    )
+    parser.add_argument("sources", nargs="+",
+                        help="과목명(1열)과 교과(군)(2열)이 있는 .tsv/.txt/.csv/.xlsx 파일")
+    parser.add_argument("--mapping", default=DEFAULT_MAPPING_FILE,
+                        help=f"갱신할 매핑 JSON 경로 (기본값: {DEFAULT_MAPPING_FILE})")
+    parser.add_argument("--overwrite", action="store_true",
+                        help="충돌 시 기존 값 대신 새 값 적용 (기본값: 기존 값 유지)")
+    parser.add_argument("--report", metavar="PATH", help="충돌 목록을 저장할 CSV 경로")
+    parser.add_argument("--dry-run", action="store_true", help="매핑 파일을 저장하지 않고 결과만 출력")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    missing = [path for path in args.sources if not os.path.isfile(path)]
+    if missing:
+        print(f"입력 파일을 찾을 수 없습니다: {', '.join(missing)}", file=sys.stderr)
+        return 2
+
+    mapping, newline, indent = load_mapping(args.mapping)
+    before = len(mapping)
+    report = MergeReport()
+    for path in args.sources:
+        merge_pairs(mapping, pairs_from_rows(iter_source_rows(path)), os.path.basename(path),
+                    args.overwrite, report)
+
+    print(f"{args.mapping}: {before}개 -> {len(mapping)}개 ({report.summary()})")
+    for key, current, value, source in report.conflicts[:20]:
+        action = "새 값 적용" if args.overwrite else "기존 값 유지"
+        print(f"  충돌: {key}: {current} / {value} ({source}, {action})")
+    if len(report.conflicts) > 20:
+        print(f"  ... 외 {len(report.conflicts) - 20}개")
+    if args.report:
+        write_conflict_report(args.report, report.conflicts)
+        print(f"충돌 목록을 저장했습니다: {args.report}")
+
+    if args.dry_run:
+        print("--dry-run: 매핑 파일을 저장하지 않았습니다.")
+    elif report.added or (args.overwrite and report.conflicts):
+        write_mapping(args.mapping, mapping, newline, indent)
+        print(f"매핑 파일을 저장했습니다: {args.mapping}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
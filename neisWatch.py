@@ -0,0 +1,128 @@
+"""폴더 감시 - 새로 들어오거나 바뀐 시수배정현황 파일이 있으면 다시 집계
+
+파일 시스템 알림 대신 주기적으로 폴더를 훑어(공유 폴더에서도 동작) 파일별
+(수정 시각, 크기)를 비교합니다. 복사 중인 파일을 읽지 않도록 마지막 변경 후
+debounce초 동안 더 바뀌지 않았을 때 한 번만 처리하며, 바뀌지 않은 파일은
+추출 결과 캐시(ExtractionCache)에서 읽으므로 바뀐 파일만 다시 파싱됩니다.
+"""
+import logging
+import os
+import re
+import time
+
+logger = logging.getLogger("neis")
+
+DEFAULT_WATCH_INTERVAL = 2.0
+DEFAULT_WATCH_DEBOUNCE = 10.0
+# parse_school_name과 같은 규칙: 파일명 괄호 안의 학교명
+SCHOOL_FILE_PATTERN = re.compile(r'\(.+?\).*\.xlsx$', re.IGNORECASE)
+
+
+class FolderWatcher:
+    """폴더의 시수배정현황 파일 목록 변화를 감지하고 변경이 잠잠해지면 알림
+
+    exclude_prefixes로 시작하는 파일(같은 폴더에 저장하는 결과 파일과
+    '결과집계표(2).xlsx' 같은 대체 이름)과 Excel 잠금 파일(~$)은 제외합니다.
+    """
+
+    def __init__(self, directories, debounce=DEFAULT_WATCH_DEBOUNCE, exclude_prefixes=()):
+        self.directories = list(directories)
+        self.debounce = debounce
+        self.exclude_prefixes = tuple(exclude_prefixes)
+        self.processed = None  # 마지막으로 처리에 성공한 {경로: (수정 시각, 크기)}
+        self.pending = None  # poll이 처리하라고 알린 목록 (mark_processed 전)
+        self.seen = None  # 마지막으로 훑은 목록
+        self.changed_at = None  # seen이 마지막으로 바뀐 시각
+
+    def scan(self):
+        """감시 폴더의 대상 파일별 (수정 시각, 크기)"""
+        snapshot = {}
+        for directory in self.directories:
+            try:
+                entries = list(os.scandir(directory))
+            except OSError as e:
+                logger.warning("폴더를 읽을 수 없습니다: %s (%s)", directory, e)
+                continue
+            for entry in entries:
+                name = entry.name
+                if (name.startswith('~$') or name.startswith(self.exclude_prefixes)
+                        or not SCHOOL_FILE_PATTERN.search(name)):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:  # 훑는 사이에 삭제된 파일
+                    continue
+                if entry.is_file():
+                    snapshot[entry.path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def poll(self, now=None):
+        """폴더를 한 번 훑어 처리할 때가 되었으면 (파일 목록, 추가, 수정, 삭제 수), 아니면 None 반환
+
+        처음 훑을 때는 이미 있는 파일을 바로 처리하고, 이후에는 마지막 변경 후
+        debounce초가 지나도록 목록이 그대로일 때만 처리합니다. 처리에 성공하면
+        mark_processed(), 실패하면 retry_later()를 호출해야 합니다.
+        """
+        now = time.monotonic() if now is None else now
+        snapshot = self.scan()
+        if snapshot != self.seen:
+            first_scan = self.seen is None
+            self.seen = snapshot
+            self.changed_at = None if first_scan else now
+        if snapshot == self.processed:
+            return None
+        if self.changed_at is not None and now - self.changed_at < self.debounce:
+            return None
+
+        previous = self.processed or {}
+        added = sum(1 for path in snapshot if path not in previous)
+        modified = sum(1 for path, state in snapshot.items() if path in previous and previous[path] != state)
+        removed = sum(1 for path in previous if path not in snapshot)
+        self.pending = snapshot
+        return sorted(snapshot), added, modified, removed
+
+    def mark_processed(self):
+        """마지막으로 알린 목록을 처리 완료로 기록 (파일이 다시 바뀔 때까지 알리지 않음)"""
+        self.processed = self.pending
+
+    def retry_later(self, now=None):
+        """처리에 실패한 목록을 debounce초 뒤에 다시 알리도록 대기 시작 시각 갱신
+
+        잠겨 있거나 아직 쓰는 중이지만 크기/수정 시각은 그대로인 파일도 다시 시도합니다.
+        """
+        self.changed_at = time.monotonic() if now is None else now
+
+
+def watch(watcher, run, interval=DEFAULT_WATCH_INTERVAL, stop_event=None):
+    """stop_event가 설정되거나 Ctrl+C를 누를 때까지 폴더를 감시하며 변경 시 run(파일 목록) 호출
+
+    run에서 오류가 나도(복사가 덜 끝난 파일, 잠긴 파일 등) 감시는 계속되며, 파일이
+    바뀌지 않아도 debounce초 뒤에 다시 처리합니다.
+    """
+    logger.info("폴더 감시를 시작합니다: %s (%g초 간격, 변경 후 %g초 대기, Ctrl+C로 종료)",
+                ', '.join(watcher.directories), interval, watcher.debounce)
+    try:
+        while stop_event is None or not stop_event.is_set():
+            change = watcher.poll()
+            if change is not None:
+                file_paths, added, modified, removed = change
+                logger.info("파일 변경 감지: 추가 %d개, 수정 %d개, 삭제 %d개 (전체 %d개)",
+                            added, modified, removed, len(file_paths))
+                if file_paths:
+                    try:
+                        run(file_paths)
+                    except Exception:
+                        logger.exception("집계 중 오류가 발생했습니다 (%g초 후 다시 시도합니다)", watcher.debounce)
+                        watcher.retry_later()
+                    else:
+                        watcher.mark_processed()
+                else:
+                    logger.warning("감시 폴더에 처리할 파일이 없습니다.")
+                    watcher.mark_processed()
+            if stop_event is None:
+                time.sleep(interval)
+            else:
+                stop_event.wait(interval)
+    except KeyboardInterrupt:
+        pass
+    logger.info("폴더 감시를 종료합니다.")